@@ -0,0 +1,190 @@
+import sys
+sys.path.append('./src')
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+from concurrent.futures import ThreadPoolExecutor
+
+from lexicon import SINO_NUMBER_WORDS
+from metrics import ItnMetrics
+
+# 합성 코퍼스용 일반 단어 (숫자/알파벳 표현이 없는 단어)
+PLAIN_WORDS = ['안녕하세요', '고객님', '네', '확인', '부탁드립니다', '감사합니다', '주소는', '서울시', '요금제',
+               '변경', '문의', '맞으실까요', '잠시만요', '기다려', '주세요', '가입자', '분', '성함', '상담', '도와드릴게요']
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux는 KB, macOS는 byte 단위
+    return rss / (1024 * 1024) if platform.system() == 'Darwin' else rss / 1024
+
+
+def load_tc(filename):
+    pairs = list()
+    with open(filename, 'r', encoding='utf8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            text, itn_text = line.split('\t')
+            pairs.append((text, itn_text))
+    return pairs
+
+
+def synthetic_corpus(size, num_words, number_density, seed=0):
+    """ number_density 비율만큼 숫자를 한 자리씩 읽은 단어가 섞인 합성 발화 """
+    rng = random.Random(seed)
+    corpus = list()
+    for _ in range(size):
+        words = list()
+        for _ in range(num_words):
+            if rng.random() < number_density:
+                words.append(''.join(rng.choice(SINO_NUMBER_WORDS[:-1]) for _ in range(rng.randint(1, 4))))
+            else:
+                words.append(rng.choice(PLAIN_WORDS))
+        corpus.append(' '.join(words))
+    return corpus
+
+
+def accuracy(converter, pairs):
+    outputs = converter.process_batch([text for text, _ in pairs])
+    correct = sum(str(output) == itn_text for output, (_, itn_text) in zip(outputs, pairs))
+    return correct / len(pairs) if pairs else 0.0
+
+
+def stage_breakdown(metrics: ItnMetrics, num_utterances):
+    """ 단계별 발화당 평균 수행 시간 (ms) """
+    stages = dict()
+    for observation in metrics.snapshot()['observations']:
+        if observation['name'] == 'stage_seconds':
+            stages[observation['labels']['stage']] = observation['sum'] * 1000 / num_utterances
+    return stages
+
+
+def run(converter, corpus, batch_size, concurrency, warmup):
+    batches = [corpus[i:i+batch_size] for i in range(0, len(corpus), batch_size)]
+    for batch in batches[:warmup]:
+        converter.process_batch(batch)
+    converter.metrics.reset()
+
+    def timed(batch):
+        start = time.perf_counter()
+        converter.process_batch(batch)
+        return (time.perf_counter() - start) * 1000, len(batch)
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(timed, batches))
+    else:
+        results = [timed(batch) for batch in batches]
+    elapsed = time.perf_counter() - start
+
+    # batch에 포함된 발화는 모두 batch 처리 시간만큼의 지연을 겪음
+    latencies = [latency for latency, num_texts in results for _ in range(num_texts)]
+    return {
+        'batch_size': batch_size,
+        'concurrency': concurrency,
+        'utterances': len(corpus),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'throughput': len(corpus) / elapsed if elapsed else 0.0,
+        'stages_ms': stage_breakdown(converter.metrics, len(corpus)),
+    }
+
+
+def compare(baseline, current, threshold):
+    """ 처리량 감소, p95 지연 증가가 threshold 비율을 넘거나 정확도가 떨어지면 실패 목록을 반환 """
+    failures = list()
+    if current['accuracy'] < baseline['accuracy']:
+        failures.append(f"accuracy {baseline['accuracy']:.4f} -> {current['accuracy']:.4f}")
+    base_runs = {(r['corpus'], r['batch_size'], r['concurrency']): r for r in baseline['runs']}
+    for r in current['runs']:
+        key = (r['corpus'], r['batch_size'], r['concurrency'])
+        base = base_runs.get(key)
+        if base is None:
+            continue
+        if r['throughput'] < base['throughput'] * (1 - threshold):
+            failures.append(f"{key} throughput {base['throughput']:.1f} -> {r['throughput']:.1f} utt/s")
+        if r['p95_ms'] > base['p95_ms'] * (1 + threshold):
+            failures.append(f"{key} p95 {base['p95_ms']:.2f} -> {r['p95_ms']:.2f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ITN benchmark')
+    parser.add_argument('--tc', default='./tc.csv')
+    parser.add_argument('--dict-path', default='./dictionary/exact_match')
+    parser.add_argument('--model-path', default='./model')
+    parser.add_argument('--synthetic-size', type=int, default=200, help='0이면 합성 코퍼스를 사용하지 않음')
+    parser.add_argument('--synthetic-words', type=int, default=12, help='합성 발화의 단어 수')
+    parser.add_argument('--number-density', type=float, default=0.2, help='합성 발화의 숫자 단어 비율')
+    parser.add_argument('--batch-sizes', default='1,8,32')
+    parser.add_argument('--concurrency', default='1')
+    parser.add_argument('--warmup', type=int, default=2, help='측정 전 수행할 batch 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='결과 JSON 파일')
+    parser.add_argument('--compare', default=None, help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--threshold', type=float, default=0.1, help='허용하는 성능 저하 비율')
+    args = parser.parse_args()
+
+    from itn import InverseTextNormalizer
+
+    start = time.perf_counter()
+    converter = InverseTextNormalizer(args.dict_path, args.model_path, metrics=ItnMetrics())
+    startup_s = time.perf_counter() - start
+
+    pairs = load_tc(args.tc)
+    corpora = {'tc': [text for text, _ in pairs]}
+    if args.synthetic_size > 0:
+        corpora['synthetic'] = synthetic_corpus(args.synthetic_size, args.synthetic_words, args.number_density, args.seed)
+
+    result = {
+        'config': vars(args),
+        'startup_s': startup_s,
+        'accuracy': accuracy(converter, pairs),
+        'runs': list(),
+    }
+    for corpus_name, corpus in corpora.items():
+        for batch_size in [int(v) for v in args.batch_sizes.split(',')]:
+            for concurrency in [int(v) for v in args.concurrency.split(',')]:
+                r = run(converter, corpus, batch_size, concurrency, args.warmup)
+                r['corpus'] = corpus_name
+                result['runs'].append(r)
+                print(f"[{corpus_name}] batch={batch_size} concurrency={concurrency} "
+                      f"p50={r['p50_ms']:.2f}ms p95={r['p95_ms']:.2f}ms p99={r['p99_ms']:.2f}ms "
+                      f"{r['throughput']:.1f} utt/s")
+                print('    ' + ' '.join(f"{stage}={ms:.3f}ms" for stage, ms in r['stages_ms'].items()))
+    result['peak_rss_mb'] = peak_rss_mb()
+    print(f"startup={startup_s:.2f}s accuracy={result['accuracy']:.4f} peak_rss={result['peak_rss_mb']:.1f}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf8') as f:
+            baseline = json.load(f)
+        failures = compare(baseline, result, args.threshold)
+        for failure in failures:
+            print(f"(REGRESSION) {failure}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
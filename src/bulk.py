@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from functools import partial
+from typing import BinaryIO, Callable, Iterable, Iterator, NamedTuple, Optional
+
+
+class BulkRecord(NamedTuple):
+    line: str  # 줄바꿈을 제외한 입력 줄
+    text: Optional[str]  # ITN 입력 문자열 (빈 줄이면 None)
+    end_offset: int  # 입력에서 이 줄이 끝나는 byte 위치
+
+
+class BulkCheckpoint:
+    """ 출력에 반영된 입력 위치 (줄 수, 입력/출력 byte 위치)를 저장하여 중단된 작업을 이어서 수행 """
+
+    def __init__(self, path):
+        self.path = path
+        self.lines = 0
+        self.input_offset = 0
+        self.output_offset = 0
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'r', encoding='utf8') as f:
+            checkpoint = json.load(f)
+        self.lines = checkpoint['lines']
+        self.input_offset = checkpoint['input_offset']
+        self.output_offset = checkpoint['output_offset']
+        return True
+
+    def save(self, lines, input_offset, output_offset):
+        self.lines = lines
+        self.input_offset = input_offset
+        self.output_offset = output_offset
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf8') as f:
+            json.dump({'lines': lines, 'input_offset': input_offset, 'output_offset': output_offset}, f)
+        os.replace(tmp_path, self.path)
+
+
+class BulkNormalizer:
+    """ 대용량 전사 파일(txt/tsv/jsonl) 또는 표준 입력을 한 줄씩 읽어 batch ITN 후 순서대로 출력
+
+    - txt: 한 줄이 하나의 발화, 출력은 ITN 결과
+    - tsv: text_column 열을 변환하여 마지막 열에 ITN 결과를 추가
+    - jsonl: text_field 값을 변환하여 itn_field에 ITN 결과를 추가
+    빈 줄은 변환하지 않고 빈 줄로 출력하여 입력과 출력의 줄 번호를 맞춤
+    입력을 chunk 단위로 읽어 처리 중인 chunk 수만 메모리에 유지하며, checkpoint_every 줄마다 출력을 flush하고 checkpoint를 저장
+    """
+    formats = ('txt', 'tsv', 'jsonl')
+
+    def __init__(self, process_iter: Callable[[Iterable[str]], Iterator], input_format='txt', text_column=0,
+                 text_field='text', itn_field='itn_text', checkpoint: BulkCheckpoint = None, checkpoint_every=10000):
+        if input_format not in self.formats:
+            raise ValueError(f"input_format must be one of {self.formats}")
+        self.process_iter = process_iter  # InverseTextNormalizer.process_iter 또는 ItnWorkerPool.process_iter
+        self.input_format = input_format
+        self.text_column = text_column
+        self.text_field = text_field
+        self.itn_field = itn_field
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+
+    def parse(self, line: str) -> str:
+        if self.input_format == 'tsv':
+            return line.split('\t')[self.text_column]
+        if self.input_format == 'jsonl':
+            return json.loads(line)[self.text_field]
+        return line
+
+    def format(self, record: BulkRecord, itn_text: str) -> str:
+        if self.input_format == 'tsv':
+            return f'{record.line}\t{itn_text}'
+        if self.input_format == 'jsonl':
+            obj = json.loads(record.line)
+            obj[self.itn_field] = itn_text
+            return json.dumps(obj, ensure_ascii=False)
+        return itn_text
+
+    def read_records(self, f: BinaryIO, offset=0) -> Iterator[BulkRecord]:
+        for raw in f:
+            offset += len(raw)
+            line = raw.decode('utf8').rstrip('\r\n')
+            yield BulkRecord(line, self.parse(line) if line else None, offset)
+
+    def process(self, input_file: BinaryIO, output_file: BinaryIO, lines=0, input_offset=0):
+        """ 입력을 처리하여 출력하고 처리한 줄 수를 반환 (lines, input_offset은 이어서 처리할 위치) """
+        records = self.read_records(input_file, input_offset)
+        # converter가 입력을 미리 읽는 만큼만 record를 보관 (입력 순서대로 결과가 반환됨, 빈 줄은 converter에 전달하지 않음)
+        pending = deque()
+
+        def texts():
+            for record in records:
+                pending.append(record)
+                if record.text is not None:
+                    yield record.text
+
+        start = time.perf_counter()
+        num_processed = 0
+        end_offset = input_offset
+
+        def write(output_line, record):
+            nonlocal num_processed, end_offset
+            output_file.write((output_line + '\n').encode('utf8'))
+            num_processed += 1
+            end_offset = record.end_offset
+            if num_processed % self.checkpoint_every == 0:
+                self.commit(output_file, lines + num_processed, end_offset)
+                elapsed = time.perf_counter() - start
+                print(f"{lines + num_processed} lines ({num_processed / elapsed:.1f} lines/s)", file=sys.stderr)
+
+        def write_blank_lines():
+            while pending and pending[0].text is None:
+                write('', pending.popleft())
+
+        for itn_result in self.process_iter(texts()):
+            write_blank_lines()
+            record = pending.popleft()
+            write(self.format(record, str(itn_result)), record)
+        write_blank_lines()
+
+        self.commit(output_file, lines + num_processed, end_offset)
+        return num_processed
+
+    def commit(self, output_file: BinaryIO, lines, input_offset):
+        output_file.flush()
+        if self.checkpoint is not None:
+            os.fsync(output_file.fileno())
+            self.checkpoint.save(lines, input_offset, output_file.tell())
+
+
+def open_input(path, checkpoint: BulkCheckpoint):
+    """ 입력을 열고 checkpoint 위치로 이동 (표준 입력은 처리한 줄 수만큼 건너뜀, 빈 줄 포함) """
+    if path == '-':
+        f = sys.stdin.buffer
+        if checkpoint.lines:
+            for skipped, _ in enumerate(f, 1):
+                if skipped == checkpoint.lines:
+                    break
+        return f
+    f = open(path, 'rb')
+    f.seek(checkpoint.input_offset)
+    return f
+
+
+def open_output(path, checkpoint: BulkCheckpoint):
+    """ 출력을 열고 checkpoint 이후에 쓰인 내용은 제거 """
+    if path == '-':
+        return sys.stdout.buffer
+    f = open(path, 'r+b' if checkpoint.output_offset else 'wb')
+    f.truncate(checkpoint.output_offset)
+    f.seek(checkpoint.output_offset)
+    return f
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대용량 파일 ITN 변환')
+    parser.add_argument('input', help="입력 파일 ('-'이면 표준 입력)")
+    parser.add_argument('output', help="출력 파일 ('-'이면 표준 출력)")
+    parser.add_argument('--format', choices=BulkNormalizer.formats, default='txt')
+    parser.add_argument('--text-column', type=int, default=0, help='tsv 입력의 텍스트 열 index')
+    parser.add_argument('--text-field', default='text', help='jsonl 입력의 텍스트 필드')
+    parser.add_argument('--itn-field', default='itn_text', help='jsonl 출력의 ITN 결과 필드')
+    parser.add_argument('--dict-path', default='./dictionary/exact_match')
+    parser.add_argument('--model-path', default='./model')
+    parser.add_argument('--workers', type=int, default=0, help='0이면 단일 프로세스로 수행')
+    parser.add_argument('--chunk-size', type=int, default=256, help='한 번에 처리할 줄 수')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--span-window', type=int, default=None, help='숫자/알파벳 표현 앞뒤 단어 수 (지정하면 해당 구간만 seq2seq 모델로 변환)')
+    parser.add_argument('--checkpoint', default=None, help='checkpoint 파일 (기본값: <output>.ckpt)')
+    parser.add_argument('--checkpoint-every', type=int, default=10000, help='checkpoint 저장 간격 (줄 수)')
+    parser.add_argument('--resume', action='store_true', help='checkpoint 위치부터 이어서 처리')
+    args = parser.parse_args()
+
+    checkpoint = BulkCheckpoint(args.checkpoint or f'{args.output}.ckpt') if args.output != '-' else None
+    if checkpoint is not None and args.resume and checkpoint.load():
+        print(f"Resuming from line {checkpoint.lines} (input offset {checkpoint.input_offset})", file=sys.stderr)
+    position = checkpoint or BulkCheckpoint(None)
+    input_file = open_input(args.input, position)
+    output_file = open_output(args.output, position)
+
+    def run(process_iter):
+        normalizer = BulkNormalizer(process_iter, args.format, text_column=args.text_column, text_field=args.text_field,
+                                    itn_field=args.itn_field, checkpoint=checkpoint, checkpoint_every=args.checkpoint_every)
+        return normalizer.process(input_file, output_file, lines=position.lines, input_offset=position.input_offset)
+
+    try:
+        if args.workers > 0:
+            from worker_pool import ItnWorkerPool
+            with ItnWorkerPool(args.dict_path, args.model_path, num_workers=args.workers, chunk_size=args.chunk_size,
+                               max_batch_size=args.batch_size, span_window=args.span_window) as pool:
+                num_processed = run(pool.process_iter)
+        else:
+            from itn import InverseTextNormalizer
+            converter = InverseTextNormalizer(args.dict_path, args.model_path, max_batch_size=args.batch_size,
+                                              span_window=args.span_window)
+            num_processed = run(partial(converter.process_iter, chunk_size=args.chunk_size))
+    finally:
+        if input_file is not sys.stdin.buffer:
+            input_file.close()
+        if output_file is not sys.stdout.buffer:
+            output_file.close()
+    print(f"Processed {num_processed} lines", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import pickle
+import threading
+from collections import OrderedDict
+
+
+class ItnResultCache:
+    """ entity 단위 ITN 결과(분류 결과, seq2seq 출력) LRU 캐시 """
+    format_version = 1
+
+    def __init__(self, max_entries=100000, max_bytes=64*1024*1024, persist_path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist_path = persist_path
+        self.hits = 0
+        self.misses = 0
+        self.num_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+        if persist_path and os.path.exists(persist_path):
+            self.load(persist_path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @staticmethod
+    def _sizeof(key, value):
+        return sys.getsizeof(key) + sum(sys.getsizeof(k) for k in key) + sum(sys.getsizeof(v) for v in value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = self._sizeof(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.num_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.num_bytes += size
+            # 오래 사용되지 않은 항목부터 제거
+            while len(self._entries) > self.max_entries or self.num_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.num_bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.num_bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.num_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def save(self, path=None):
+        path = path or self.persist_path
+        if not path:
+            raise ValueError('The cache path is not specified')
+        with self._lock:
+            items = [(key, value) for key, (value, _) in self._entries.items()]
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'format_version': self.format_version, 'items': items}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        path = path or self.persist_path
+        try:
+            with open(path, 'rb') as f:
+                saved = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Failed to load ITN cache from {path}: {e}")
+            return
+        if saved.get('format_version') != self.format_version:
+            print(f"ITN cache format of {path} is not supported. The cache is ignored.")
+            return
+        for key, value in saved['items']:
+            self.put(key, value)
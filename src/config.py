@@ -0,0 +1,76 @@
+import os
+from dataclasses import dataclass, fields
+from typing import Optional
+
+
+@dataclass
+class OnnxRuntimeConfig:
+    """ ONNX Runtime 세션 설정 (분류 모델, seq2seq 모델 세션에 공통 적용) """
+    intra_op_num_threads: int = 3  # 0이면 ORT 기본값 (물리 코어 수)
+    inter_op_num_threads: int = 1
+    execution_mode: str = 'sequential'  # sequential, parallel
+    graph_optimization_level: str = 'all'  # disable, basic, extended, all
+    enable_cpu_mem_arena: bool = True
+    enable_mem_pattern: bool = True
+    allow_spinning: bool = True  # 워커가 여러 개인 경우 False 권장
+    optimized_model_dir: Optional[str] = None  # 최적화된 graph 저장 경로
+    provider: str = 'CPUExecutionProvider'
+    backend: str = 'optimum'  # optimum, onnxruntime (torch 없이 ONNX Runtime 세션을 직접 수행)
+
+    execution_modes = ('sequential', 'parallel')
+    graph_optimization_levels = ('disable', 'basic', 'extended', 'all')
+    backends = ('optimum', 'onnxruntime')
+
+    def __post_init__(self):
+        if self.execution_mode not in self.execution_modes:
+            raise ValueError(f"execution_mode must be one of {self.execution_modes}: '{self.execution_mode}'")
+        if self.graph_optimization_level not in self.graph_optimization_levels:
+            raise ValueError(f"graph_optimization_level must be one of {self.graph_optimization_levels}: '{self.graph_optimization_level}'")
+        if self.backend not in self.backends:
+            raise ValueError(f"backend must be one of {self.backends}: '{self.backend}'")
+
+    @classmethod
+    def from_env(cls, prefix='ITN_ORT_', **defaults):
+        """ 환경 변수(ex. ITN_ORT_INTRA_OP_NUM_THREADS=1, ITN_ORT_BACKEND=onnxruntime)로 배포 환경별 설정을 덮어씀
+
+        defaults는 환경 변수가 없는 항목의 기본값 (모델 설정을 지정하지 않으면 InverseTextNormalizer가 이 설정을 사용)
+        """
+        kwargs = dict(defaults)
+        for f in fields(cls):
+            value = os.environ.get(prefix + f.name.upper())
+            if value is None:
+                continue
+            if f.type is int:
+                value = int(value)
+            elif f.type is bool:
+                value = value.lower() in ('1', 'true', 'yes', 'on')
+            kwargs[f.name] = value
+        return cls(**kwargs)
+
+    def to_session_options(self, model_name=None):
+        import onnxruntime
+
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = self.intra_op_num_threads
+        session_options.inter_op_num_threads = self.inter_op_num_threads
+        session_options.execution_mode = {
+            'sequential': onnxruntime.ExecutionMode.ORT_SEQUENTIAL,
+            'parallel': onnxruntime.ExecutionMode.ORT_PARALLEL,
+        }[self.execution_mode]
+        session_options.graph_optimization_level = {
+            'disable': onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            'basic': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+            'extended': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+            'all': onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+        }[self.graph_optimization_level]
+        session_options.enable_cpu_mem_arena = self.enable_cpu_mem_arena
+        session_options.enable_mem_pattern = self.enable_mem_pattern
+        allow_spinning = '1' if self.allow_spinning else '0'
+        session_options.add_session_config_entry('session.intra_op.allow_spinning', allow_spinning)
+        session_options.add_session_config_entry('session.inter_op.allow_spinning', allow_spinning)
+
+        # 세션 하나에 파일 하나를 저장해야 하므로 model_name이 주어진 경우에만 적용
+        if self.optimized_model_dir and model_name:
+            os.makedirs(self.optimized_model_dir, exist_ok=True)
+            session_options.optimized_model_filepath = os.path.join(self.optimized_model_dir, f'{model_name}.onnx')
+        return session_options
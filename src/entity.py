@@ -1,3 +1,5 @@
+import bisect
+from array import array
 from dataclasses import dataclass, field
 from typing import Literal, List, Dict
 from enum import Enum, auto
@@ -11,27 +13,113 @@ class ItnEntityStatus(Enum):
     POSTPROCESS = auto()
 
 
-@dataclass
+class ItnUtterance:
+    """ 원본 발화 문자열과 공백 제거 위치 -> 원본 위치 offset (발화당 한 번 계산하여 entity가 공유) """
+    __slots__ = ('text', 'nospace2text')
+
+    def __init__(self, text: str):
+        self.text = text
+        # 마지막 원소는 문자열 길이 (공백 제거 문자열 끝 위치에 대응)
+        self.nospace2text = array('l', [idx for idx, ch in enumerate(text) if ch != ' '])
+        self.nospace2text.append(len(text))
+
+
+class ItnOffsetMap:
+    """ entity의 itn 위치 -> text 위치 mapping (ItnUtterance의 offset 배열을 참조하는 view) """
+    __slots__ = ('offsets', 'first', 'base', 'limit')
+
+    def __init__(self, offsets, first, base, limit):
+        self.offsets = offsets
+        self.first = first  # entity 시작 위치의 offset 배열 index
+        self.base = base  # entity 시작 위치 (원본 기준)
+        self.limit = limit  # entity 길이
+
+    def __getitem__(self, pos):
+        if pos < 0 or pos > len(self):
+            raise KeyError(pos)
+        return min(self.offsets[self.first + pos] - self.base, self.limit)
+
+    def __len__(self):
+        return bisect.bisect_left(self.offsets, self.base + self.limit, self.first) - self.first
+
+    def items(self):
+        return ((pos, self[pos]) for pos in range(len(self)))
+
+    def to_dict(self) -> Dict[int, int]:
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (ItnOffsetMap, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, ItnOffsetMap) else other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
 class ItnEntity:
-    idx: int
-    text: str  # 공백이 있는 원본 문자열
-    itn_text: str = None  # 초기에는 공백 제거된 문자열, 나중에는 ITN 문자열을 저장
-    status: Literal[ItnEntityStatus.INIT, ItnEntityStatus.EXACT, ItnEntityStatus.REGEX, ItnEntityStatus.MODEL, ItnEntityStatus.POSTPROCESS] = ItnEntityStatus.INIT  # init -> exact matching -> regex matching -> itn model -> postprocess
-    idx_itn2text: Dict[int, int] = field(default_factory=dict)  # text와 itn의 position mapping info
-    blank_l: bool = False  # 왼쪽 공백
-    blank_r: bool = False  # 오른쪽 공백
-
-    def __post_init__(self):
-        if self.text[0] == ' ':
-            self.blank_l = True
-        if self.text[-1] == ' ':
-            self.blank_r = True
-        self.text = self.text.strip()
-
-        if not self.itn_text:
-            self.itn_text = self.text.replace(' ', '')  # remove all blanks
-        if self.status == ItnEntityStatus.INIT or self.status == ItnEntityStatus.EXACT:
-            self.idx_itn2text = self.get_text_idx_from_itn_idx(self.itn_text, self.text)
+    """ ITN 처리 단위
+
+    문자열을 복사하지 않고 원본 발화(ItnUtterance)의 [start, end) 위치를 참조하며, 양쪽 공백은 제외하고 blank_l, blank_r로 표시
+    source 없이 text로 생성하면 text를 원본 발화로 사용
+    """
+    __slots__ = ('idx', 'status', 'blank_l', 'blank_r', 'source', 'start', 'end', '_itn_text')
+
+    def __init__(self, idx: int, text: str = None, itn_text: str = None,
+                 status: Literal[ItnEntityStatus.INIT, ItnEntityStatus.EXACT, ItnEntityStatus.REGEX, ItnEntityStatus.MODEL, ItnEntityStatus.POSTPROCESS] = ItnEntityStatus.INIT,
+                 idx_itn2text: Dict[int, int] = None, blank_l: bool = False, blank_r: bool = False,
+                 source: ItnUtterance = None, start: int = 0, end: int = None):
+        # idx_itn2text는 source의 offset 배열에서 계산하므로 인자는 호환성을 위해서만 유지
+        if source is None:
+            source = ItnUtterance(text)
+            start, end = 0, len(text)
+        elif end is None:
+            end = len(source.text)
+
+        raw = source.text
+        if start < end and raw[start] == ' ':
+            blank_l = True
+        if start < end and raw[end-1] == ' ':
+            blank_r = True
+        while start < end and raw[start] == ' ':
+            start += 1
+        while start < end and raw[end-1] == ' ':
+            end -= 1
+
+        self.idx = idx
+        self.status = status  # init -> exact matching -> regex matching -> itn model -> postprocess
+        self.blank_l = blank_l  # 왼쪽 공백
+        self.blank_r = blank_r  # 오른쪽 공백
+        self.source = source
+        self.start = start
+        self.end = end
+        self._itn_text = itn_text or None  # 초기에는 공백 제거된 문자열, 나중에는 ITN 문자열을 저장
+
+    @property
+    def text(self) -> str:
+        """ 공백이 있는 원본 문자열 """
+        return self.source.text[self.start:self.end]
+
+    @property
+    def itn_text(self) -> str:
+        if self._itn_text is None:
+            self._itn_text = self.text.replace(' ', '')  # remove all blanks
+        return self._itn_text
+
+    @itn_text.setter
+    def itn_text(self, itn_text: str):
+        self._itn_text = itn_text
+
+    @property
+    def idx_itn2text(self) -> ItnOffsetMap:
+        """ text와 itn의 position mapping info """
+        offsets = self.source.nospace2text
+        first = bisect.bisect_left(offsets, self.start)
+        return ItnOffsetMap(offsets, first, self.start, self.end - self.start)
+
+    def sub_entity(self, text_start: int, text_end: int, **kwargs) -> 'ItnEntity':
+        """ text[text_start:text_end] 부분을 같은 원본 발화를 참조하는 entity로 생성 """
+        return ItnEntity(source=self.source, start=self.start + text_start, end=self.start + text_end, **kwargs)
 
     def get_text_idx_from_itn_idx(self, itn_text, text):
         """ text에서 띄어쓰기 제거된 itn의 position 매핑 정보 """
@@ -44,10 +132,29 @@ class ItnEntity:
             pos += 1
         return idx_itn2text
 
+    def _key(self):
+        return (self.idx, self.text, self.itn_text, self.status, self.blank_l, self.blank_r)
+
+    def __eq__(self, other):
+        if not isinstance(other, ItnEntity):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __repr__(self):
+        return (f'ItnEntity(idx={self.idx!r}, text={self.text!r}, itn_text={self.itn_text!r}, status={self.status!r}, '
+                f'idx_itn2text={self.idx_itn2text!r}, blank_l={self.blank_l!r}, blank_r={self.blank_r!r})')
+
+
 @dataclass
 class ItnData:
     itn_entity_list: List[ItnEntity] = field(default_factory=list)  # itn entity 리스트
 
+    @classmethod
+    def from_text(cls, text: str) -> 'ItnData':
+        data = cls()
+        data.add(ItnEntity(idx=1, text=text))
+        return data
+
     def add(self, entity: ItnEntity):
         self.itn_entity_list.append(entity)
     
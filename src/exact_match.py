@@ -1,15 +1,174 @@
 import ahocorasick
 import os
 import glob
+import pickle
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, replace
 from entity import ItnData, ItnEntity, ItnEntityStatus
-from typing import List
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class ExactMatchDictionary:
+    """ 한 버전의 사전 (reload 시 통째로 교체되며 수정하지 않음) """
+    version: str
+    system_dictionary: Dict[int, str]
+    system_matcher: ahocorasick.Automaton
+    user_dictionary: Dict[int, str]
+    user_matcher: ahocorasick.Automaton
+    load_duration: float = 0.0  # 사전 로드 시간 (초)
 
 
 class ExactMatcher:
-    def __init__(self, dict_path='./dictionary/exact_match'):
-        self.system_dictionary, self.system_matcher = self.load_system_dictionary(dict_path)
-        self.user_dictionary, self.user_matcher = self.load_user_dictionary(dict_path)
-    
+    artifact_format_version = 2
+    artifact_filename = 'exact_match.compiled'
+
+    def __init__(self, dict_path='./dictionary/exact_match', artifact_path=None, use_artifact=True):
+        self.dict_path = dict_path
+        self.artifact_path = artifact_path or os.path.join(dict_path, self.artifact_filename)
+        self.use_artifact = use_artifact
+        self.dictionary = self.load_dictionary()
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop_watching = threading.Event()
+
+    @property
+    def version(self):
+        return self.dictionary.version
+
+    @property
+    def load_duration(self):
+        return self.dictionary.load_duration
+
+    @property
+    def system_dictionary(self):
+        return self.dictionary.system_dictionary
+
+    @property
+    def system_matcher(self):
+        return self.dictionary.system_matcher
+
+    @property
+    def user_dictionary(self):
+        return self.dictionary.user_dictionary
+
+    @property
+    def user_matcher(self):
+        return self.dictionary.user_matcher
+
+    def load_dictionary(self) -> ExactMatchDictionary:
+        start = time.perf_counter()
+        version = self.get_dictionary_version(self.dict_path)
+
+        # 사전 파일이 바뀌지 않았으면 컴파일된 automaton을 그대로 로드
+        dictionary = self.load_compiled_dictionary(self.artifact_path, version) if self.use_artifact else None
+        if dictionary is None:
+            system_dictionary, system_matcher = self.load_system_dictionary(self.dict_path)
+            user_dictionary, user_matcher = self.load_user_dictionary(self.dict_path)
+            dictionary = ExactMatchDictionary(version, system_dictionary, system_matcher, user_dictionary, user_matcher)
+            if self.use_artifact:
+                try:
+                    self.save_compiled_dictionary(self.artifact_path, dictionary)
+                except OSError as e:
+                    print(f"Failed to save compiled dictionary to {self.artifact_path}: {e}")
+        return replace(dictionary, load_duration=time.perf_counter() - start)
+
+    def reload(self, background=False):
+        """ 새 사전을 빌드한 뒤 교체 (처리 중인 process 호출은 이전 사전으로 끝까지 수행) """
+        if background:
+            thread = threading.Thread(target=self.reload, name='exact-match-reload', daemon=True)
+            thread.start()
+            return thread
+
+        with self._reload_lock:
+            dictionary = self.load_dictionary()
+            self.dictionary = dictionary
+        print(f"Reloaded dictionaries: version {dictionary.version} ({dictionary.load_duration*1000:.1f} ms)")
+        return dictionary
+
+    def get_dictionary_signature(self):
+        """ 사전 파일 변경 여부를 빠르게 확인하기 위한 (파일명, 수정 시간, 크기) 목록 """
+        signature = list()
+        for filename in sorted(glob.glob(os.path.join(self.dict_path, '*.dict'))):
+            stat = os.stat(filename)
+            signature.append((filename, stat.st_mtime_ns, stat.st_size))
+        return signature
+
+    def start_watching(self, interval=5.0):
+        """ interval초마다 사전 파일을 확인하여 변경되면 reload """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        initial_signature = self.get_dictionary_signature()
+
+        def watch():
+            signature = initial_signature
+            while not self._stop_watching.wait(interval):
+                try:
+                    new_signature = self.get_dictionary_signature()
+                    if new_signature == signature:
+                        continue
+                    signature = new_signature
+                    if self.get_dictionary_version(self.dict_path) != self.version:
+                        self.reload()
+                except Exception as e:
+                    print(f"Failed to reload dictionaries: {e}")
+
+        self._watcher = threading.Thread(target=watch, name='exact-match-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+
+    @staticmethod
+    def get_dictionary_version(dict_path):
+        """ 사전 파일 이름과 내용으로 사전 버전을 계산 """
+        sha = hashlib.sha1()
+        for filename in sorted(glob.glob(os.path.join(dict_path, '*.dict'))):
+            sha.update(os.path.basename(filename).encode('utf8'))
+            with open(filename, 'rb') as f:
+                sha.update(f.read())
+        return sha.hexdigest()[:12]
+
+    def load_compiled_dictionary(self, artifact_path, version):
+        """ 컴파일된 사전을 로드 (없거나 사전 버전이 다르면 None) """
+        if not os.path.exists(artifact_path):
+            return None
+        try:
+            with open(artifact_path, 'rb') as f:
+                artifact = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+            print(f"Failed to load compiled dictionary {artifact_path}: {e}")
+            return None
+        if artifact.get('format_version') != self.artifact_format_version or artifact.get('version') != version:
+            print(f"Compiled dictionary {artifact_path} is outdated. Rebuilding dictionaries.")
+            return None
+        print(f"Loading compiled dictionary: {os.path.basename(artifact_path)} (version {version})")
+        return ExactMatchDictionary(version, artifact['system_dictionary'], artifact['system_matcher'],
+                                    artifact['user_dictionary'], artifact['user_matcher'])
+
+    def save_compiled_dictionary(self, artifact_path, dictionary: ExactMatchDictionary = None):
+        """ 빌드된 automaton과 치환 테이블을 사전 버전과 함께 저장 """
+        dictionary = dictionary or self.dictionary
+        artifact = {
+            'format_version': self.artifact_format_version,
+            'version': dictionary.version,
+            'system_dictionary': dictionary.system_dictionary,
+            'system_matcher': dictionary.system_matcher,
+            'user_dictionary': dictionary.user_dictionary,
+            'user_matcher': dictionary.user_matcher,
+        }
+        tmp_path = f'{artifact_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, artifact_path)
+
     def load_system_dictionary(self, system_dict_path):
         dictionary = dict()
         matcher = ahocorasick.Automaton()
@@ -79,15 +238,18 @@ class ExactMatcher:
         return old, new
     
     def process(self, entities: List[ItnEntity]) -> List[ItnEntity]:
-        # 1. find matches in system dictionary (ignore whitespaces)
-        entities = self.match_system_dictionary(entities)
+        # 처리 도중 reload되어도 같은 버전의 사전을 사용
+        dictionary = self.dictionary
 
-        # 2. find matches in user dictionary (allow whitespaces)
-        entities = self.match_user_dictionary(entities)
+        # 시스템 사전(띄어쓰기 무시)과 사용자 사전(띄어쓰기 포함)을 한 번에 매칭
+        return self.match_dictionaries(entities, dictionary=dictionary)
 
-        return entities
+    def match_dictionaries(self, entities: List[ItnEntity], idx_start=-1, dictionary: ExactMatchDictionary = None) -> List[ItnEntity]:
+        """ entity별로 시스템 사전 매칭을 찾고, 매칭 사이 구간에서만 사용자 사전 매칭을 찾아 최종 entity를 한 번에 생성
 
-    def match_system_dictionary(self, entities: List[ItnEntity], idx_start=-1) -> List[ItnEntity]:
+        시스템 사전 매칭이 우선하며, 시스템 사전 -> 사용자 사전 순서로 entity를 나누어 매칭한 결과와 같다.
+        """
+        dictionary = dictionary or self.dictionary
         if idx_start == -1:
             idx = entities[0].idx
         else:
@@ -95,99 +257,99 @@ class ExactMatcher:
 
         entity_list = list()
         for entity in entities:
-            text = entity.text
-            itn_text = entity.itn_text
-            status = entity.status
-            idx_itn2text = entity.idx_itn2text
-
             if entity.status != ItnEntityStatus.INIT:
                 entity.idx = idx
                 entity_list.append(entity)
                 idx += 1
                 continue
-            
-            prev_text_end = 0
-            pos_word_list = list(self.system_matcher.iter_long(itn_text))
-            if not pos_word_list:
+
+            segments = self.find_segments(entity.text, entity.itn_text, entity.idx_itn2text, dictionary)
+            if not segments:
                 entity.idx = idx
                 entity_list.append(entity)
                 idx += 1
                 continue
 
-            for last_char_pos, (key_id, word_no_space) in pos_word_list:
-                word_start = last_char_pos + 1 - len(word_no_space)
-                word_end = last_char_pos + 1
-                text_start = idx_itn2text[word_start]
-                text_end = idx_itn2text[word_end]
-                
-                if text_start == prev_text_end:
-                    entity_list.append(ItnEntity(idx=idx, text=text[text_start:text_end], itn_text=self.system_dictionary[key_id], status=ItnEntityStatus.EXACT))
-                    idx += 1
-                elif text_start > prev_text_end:
-                    entity_list.append(ItnEntity(idx=idx, text=text[prev_text_end:text_start], status=status))
-                    entity_list.append(ItnEntity(idx=idx+1, text=text[text_start:text_end], itn_text=self.system_dictionary[key_id], status=ItnEntityStatus.EXACT))
-                    idx += 2
+            for text_start, text_end, itn_text in segments:
+                if itn_text is None:
+                    entity_list.append(entity.sub_entity(text_start, text_end, idx=idx, status=ItnEntityStatus.INIT))
                 else:
-                    raise ValueError
-                prev_text_end = text_end
-            
-            if prev_text_end < len(text):
-                entity_list.append(ItnEntity(idx=idx, text=text[prev_text_end:], status=ItnEntityStatus.INIT))
+                    entity_list.append(entity.sub_entity(text_start, text_end, idx=idx, itn_text=itn_text, status=ItnEntityStatus.EXACT))
                 idx += 1
 
         return entity_list
-    
-    def match_user_dictionary(self, entities: List[ItnEntity], idx_start=-1) -> List[ItnEntity]:
-        if idx_start == -1:
-            idx = entities[0].idx
-        else:
-            idx = idx_start
 
-        entity_list = list()
-        for entity in entities:
-            text = entity.text
-            status = entity.status
+    @staticmethod
+    def find_segments(text, itn_text, idx_itn2text, dictionary: ExactMatchDictionary) -> List[Tuple[int, int, str]]:
+        """ text를 나눈 (start, end, 변환 문자열) 리스트 (매칭되지 않은 구간은 변환 문자열이 None, 매칭이 없으면 빈 리스트)
 
-            if status != ItnEntityStatus.INIT:
-                entity.idx = idx
-                entity_list.append(entity)
-                idx += 1
-                continue
-            
-            prev_text_end = 0
-            pos_word_list = list(self.user_matcher.iter_long(text))
-            if not pos_word_list:
-                entity.idx = idx
-                entity_list.append(entity)
-                idx += 1
-                continue
+        시스템 사전 매칭 사이 구간은 양쪽 공백을 제외하고 사용자 사전으로 매칭
+        """
+        segments = list()
+        user_matcher = dictionary.user_matcher
+        user_dictionary = dictionary.user_dictionary
 
-            for last_char_pos, (key_id, word) in pos_word_list:
-                text_start = last_char_pos + 1 - len(word)
-                text_end = last_char_pos + 1
-                
-                if text_start == prev_text_end:
-                    entity_list.append(ItnEntity(idx=idx, text=text[text_start:text_end], itn_text=self.user_dictionary[key_id], status=ItnEntityStatus.EXACT))
-                    idx += 1
-                elif text_start > prev_text_end:
-                    entity_list.append(ItnEntity(idx=idx, text=text[prev_text_end:text_start], status=status))
-                    entity_list.append(ItnEntity(idx=idx+1, text=text[text_start:text_end], itn_text=self.user_dictionary[key_id], status=ItnEntityStatus.EXACT))
-                    idx += 2
-                else:
-                    raise ValueError
-                prev_text_end = text_end
-            
-            if prev_text_end < len(text):
-                entity_list.append(ItnEntity(idx=idx, text=text[prev_text_end:], status=ItnEntityStatus.INIT))
-                idx += 1
+        def match_user(start, end):
+            # 구간 문자열을 만들지 않고 원문에서 양쪽 공백을 제외한 구간만 매칭 (위치는 원문 기준)
+            match_start, match_end = start, end
+            while match_start < match_end and text[match_start] == ' ':
+                match_start += 1
+            while match_start < match_end and text[match_end-1] == ' ':
+                match_end -= 1
+            user_segments = list()
+            prev_end = match_start
+            matches = user_matcher.iter_long(text, match_start, match_end) if match_start < match_end else ()
+            for last_char_pos, (key_id, word) in matches:
+                word_start = last_char_pos + 1 - len(word)
+                if word_start > prev_end:
+                    user_segments.append((prev_end, word_start, None))
+                user_segments.append((word_start, last_char_pos + 1, user_dictionary[key_id]))
+                prev_end = last_char_pos + 1
+            if not user_segments:
+                segments.append((start, end, None))
+                return
+            if prev_end < match_end:
+                user_segments.append((prev_end, match_end, None))
+            segments.extend(user_segments)
 
-        return entity_list
+        prev_text_end = 0
+        for last_char_pos, (key_id, word_no_space) in dictionary.system_matcher.iter_long(itn_text):
+            text_start = idx_itn2text[last_char_pos + 1 - len(word_no_space)]
+            text_end = idx_itn2text[last_char_pos + 1]
+            if text_start < prev_text_end:
+                raise ValueError
+            if text_start > prev_text_end:
+                match_user(prev_text_end, text_start)
+            segments.append((text_start, text_end, dictionary.system_dictionary[key_id]))
+            prev_text_end = text_end
+
+        if not segments:
+            match_user(0, len(text))
+            if segments[0][2] is None and len(segments) == 1:
+                return []  # 매칭 없음
+        elif prev_text_end < len(text):
+            match_user(prev_text_end, len(text))
+        return segments
 
 
 if __name__ == '__main__':
-    matcher = ExactMatcher()
-    data = ItnData()
-    data.add(ItnEntity(1, '주소는 서울시 은평구 사당로이십사길 삼십팔 다시 칠 입니다'))
-    print(data)
-    data.itn_entity_list = matcher.process(data.itn_entity_list)
-    print(data)
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Exact match dictionary')
+    parser.add_argument('--dict-path', default='./dictionary/exact_match')
+    parser.add_argument('--compile', action='store_true', help='사전을 컴파일하여 저장')
+    parser.add_argument('--output', default=None, help='컴파일된 사전 경로')
+    args = parser.parse_args()
+
+    if args.compile:
+        matcher = ExactMatcher(args.dict_path, use_artifact=False)
+        artifact_path = args.output or os.path.join(args.dict_path, ExactMatcher.artifact_filename)
+        matcher.save_compiled_dictionary(artifact_path)
+        print(f"Saved compiled dictionary: {artifact_path} (version {matcher.version}, {matcher.load_duration*1000:.1f} ms)")
+    else:
+        matcher = ExactMatcher(args.dict_path)
+        data = ItnData()
+        data.add(ItnEntity(1, '주소는 서울시 은평구 사당로이십사길 삼십팔 다시 칠 입니다'))
+        print(data)
+        data.itn_entity_list = matcher.process(data.itn_entity_list)
+        print(data)
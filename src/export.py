@@ -0,0 +1,212 @@
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import argparse
+
+from config import OnnxRuntimeConfig
+
+# ItnModel이 로드하는 모델 디렉토리 이름과 ONNX 파일 이름
+MODEL_FILES = {
+    'itncls': ['model'],
+    'itn': ['encoder_model', 'decoder_model', 'decoder_with_past_model'],
+}
+QUANTIZATION_ARCHS = ('avx2', 'avx512', 'avx512_vnni', 'arm64')
+
+
+def load_pairs(filename):
+    """ (입력, 정답) 탭 구분 평가 파일 """
+    pairs = list()
+    with open(filename, 'r', encoding='utf8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            text, itn_text = line.split('\t')
+            pairs.append((text, itn_text))
+    return pairs
+
+
+def evaluate(model_root, dict_path, eval_files, runtime_config: OnnxRuntimeConfig = None):
+    """ 평가 파일별 정확도 (모델 디렉토리 model_root/itncls, model_root/itn) """
+    from itn import InverseTextNormalizer
+
+    converter = InverseTextNormalizer(dict_path, model_root, runtime_config=runtime_config)
+    accuracy = dict()
+    for eval_file in eval_files:
+        pairs = load_pairs(eval_file)
+        outputs = converter.process_batch([text for text, _ in pairs])
+        correct = sum(str(output) == itn_text for output, (_, itn_text) in zip(outputs, pairs))
+        accuracy[os.path.basename(eval_file)] = correct / len(pairs) if pairs else 0.0
+    return accuracy
+
+
+def has_float_onnx(source, name):
+    return os.path.exists(os.path.join(source, f'{name}.onnx'))
+
+
+def export_model(source, output_dir, model_dir):
+    """ transformers checkpoint를 ONNX로 export (이미 ONNX float 모델이 있으면 그대로 로드) """
+    from transformers import AutoTokenizer
+
+    export = not all(has_float_onnx(source, name) for name in MODEL_FILES[model_dir] if name != 'decoder_with_past_model')
+    print(f"{'Exporting' if export else 'Loading'} {model_dir} model: {source}")
+    if model_dir == 'itncls':
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        model = ORTModelForSequenceClassification.from_pretrained(source, export=export)
+    else:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        model = ORTModelForSeq2SeqLM.from_pretrained(source, export=export, use_cache=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(source).save_pretrained(output_dir)
+    return model
+
+
+def rename_outputs(output_dir, suffix):
+    """ optimum이 저장한 {name}_{suffix}.onnx 파일을 {name}.onnx로 교체 """
+    for filepath in glob.glob(os.path.join(output_dir, f'*_{suffix}.onnx')):
+        os.replace(filepath, filepath[:-len(f'_{suffix}.onnx')] + '.onnx')
+
+
+def optimize_model(model, output_dir, optimization_level):
+    """ ONNX Runtime graph 최적화 (0이면 수행하지 않음) """
+    if optimization_level == 0:
+        return
+    from optimum.onnxruntime import ORTOptimizer
+    from optimum.onnxruntime.configuration import OptimizationConfig
+
+    print(f"Optimizing graph (level {optimization_level}): {output_dir}")
+    optimizer = ORTOptimizer.from_pretrained(model)
+    optimizer.optimize(save_dir=output_dir, optimization_config=OptimizationConfig(optimization_level=optimization_level),
+                       file_suffix='optimized')
+    rename_outputs(output_dir, 'optimized')
+
+
+def calibration_dataset(output_dir, model_dir, texts, max_length=128):
+    """ 정적 양자화 calibration 입력 (추론과 같이 공백 제거 후 " < es >"를 붙여 tokenize) """
+    from datasets import Dataset
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(output_dir)
+    if model_dir == 'itncls':
+        texts = [text + " < es >" for text in texts]
+    else:
+        texts = [text.replace(" ", "") + " < es >" for text in texts]
+    inputs = tokenizer(texts, padding='max_length', truncation=True, max_length=max_length)
+    columns = {'input_ids': inputs['input_ids'], 'attention_mask': inputs['attention_mask']}
+    if model_dir == 'itncls':
+        columns['token_type_ids'] = [[0] * len(ids) for ids in inputs['input_ids']]
+    return Dataset.from_dict(columns)
+
+
+def quantize_model(output_dir, model_dir, quantization, arch, per_channel, calibration_texts=None):
+    """ INT8 양자화 후 {name}_quantized.onnx로 저장하고 float 모델은 삭제
+
+    정적 양자화는 분류 모델과 encoder에만 적용 (decoder는 생성 중 입력을 calibration하기 어려워 동적 양자화)
+    """
+    if quantization == 'none':
+        return
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoCalibrationConfig, AutoQuantizationConfig
+
+    for name in MODEL_FILES[model_dir]:
+        filename = f'{name}.onnx'
+        if not os.path.exists(os.path.join(output_dir, filename)):
+            continue
+        is_static = quantization == 'static' and name in ('model', 'encoder_model')
+        print(f"Quantizing {model_dir}/{filename} ({'static' if is_static else 'dynamic'}, {arch})")
+        quantization_config = getattr(AutoQuantizationConfig, arch)(is_static=is_static, per_channel=per_channel)
+        quantizer = ORTQuantizer.from_pretrained(output_dir, file_name=filename)
+        ranges = None
+        if is_static:
+            dataset = calibration_dataset(output_dir, model_dir, calibration_texts)
+            augmented_model_path = os.path.join(output_dir, 'augmented_model.onnx')
+            ranges = quantizer.fit(dataset=dataset, calibration_config=AutoCalibrationConfig.minmax(dataset),
+                                   onnx_augmented_model_name=augmented_model_path,
+                                   operators_to_quantize=quantization_config.operators_to_quantize)
+            os.remove(augmented_model_path)
+        quantizer.quantize(save_dir=output_dir, quantization_config=quantization_config, calibration_tensors_range=ranges)
+        os.remove(os.path.join(output_dir, filename))
+
+
+def write_manifest(model_root, manifest):
+    with open(os.path.join(model_root, 'manifest.json'), 'w', encoding='utf8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ITN 모델 export, 최적화, INT8 양자화 및 정확도 검증')
+    parser.add_argument('name', help='배포할 모델 이름 (<output-root>/<name>에 저장)')
+    parser.add_argument('--cls-source', required=True, help='분류 모델 transformers checkpoint 또는 float ONNX 디렉토리')
+    parser.add_argument('--itn-source', required=True, help='seq2seq 모델 transformers checkpoint 또는 float ONNX 디렉토리')
+    parser.add_argument('--output-root', default='./model')
+    parser.add_argument('--optimization-level', type=int, choices=[0, 1, 2, 99], default=1,
+                        help='ONNX Runtime graph 최적화 수준 (0이면 수행하지 않음)')
+    parser.add_argument('--quantization', choices=['none', 'dynamic', 'static'], default='dynamic')
+    parser.add_argument('--arch', choices=QUANTIZATION_ARCHS, default='avx512_vnni', help='양자화 대상 CPU 명령어')
+    parser.add_argument('--per-channel', action='store_true')
+    parser.add_argument('--dict-path', default='./dictionary/exact_match')
+    parser.add_argument('--eval', nargs='+', default=['./tc.csv'], help='정확도 평가 파일 (첫 파일은 정적 양자화 calibration에도 사용)')
+    parser.add_argument('--min-accuracy', type=float, default=None, help='평가 파일별 최소 정확도 (--baseline과 둘 중 하나는 필수)')
+    parser.add_argument('--baseline', default=None, help='비교할 기준 모델 디렉토리 (ex. ./model, --min-accuracy와 둘 중 하나는 필수)')
+    parser.add_argument('--max-drop', type=float, default=0.0, help='기준 모델 대비 허용하는 정확도 감소')
+    parser.add_argument('--overwrite', action='store_true', help='같은 이름의 모델이 있으면 교체')
+    args = parser.parse_args()
+    if args.min_accuracy is None and args.baseline is None:
+        parser.error('accuracy gate is required: specify --min-accuracy and/or --baseline')
+
+    model_root = os.path.join(args.output_root, args.name)
+    if os.path.exists(model_root) and not args.overwrite:
+        print(f"{model_root} already exists. Use --overwrite to replace it.")
+        sys.exit(1)
+    staging_root = os.path.join(args.output_root, f'.staging-{args.name}')
+    shutil.rmtree(staging_root, ignore_errors=True)
+
+    start = time.perf_counter()
+    calibration_texts = [text for text, _ in load_pairs(args.eval[0])]
+    for model_dir, source in (('itncls', args.cls_source), ('itn', args.itn_source)):
+        output_dir = os.path.join(staging_root, model_dir)
+        model = export_model(source, output_dir, model_dir)
+        optimize_model(model, output_dir, args.optimization_level)
+        quantize_model(output_dir, model_dir, args.quantization, args.arch, args.per_channel, calibration_texts)
+    build_s = time.perf_counter() - start
+
+    # 정확도 검증 (배포 환경과 같은 ITN_ORT_* 설정으로 평가)
+    runtime_config = OnnxRuntimeConfig.from_env()
+    accuracy = evaluate(staging_root, args.dict_path, args.eval, runtime_config)
+    baseline_accuracy = evaluate(args.baseline, args.dict_path, args.eval, runtime_config) if args.baseline else None
+    failures = list()
+    for eval_name, value in accuracy.items():
+        print(f"{eval_name}: accuracy {value:.4f}" + (f" (baseline {baseline_accuracy[eval_name]:.4f})" if baseline_accuracy else ''))
+        if args.min_accuracy is not None and value < args.min_accuracy:
+            failures.append(f"{eval_name} accuracy {value:.4f} < {args.min_accuracy:.4f}")
+        if baseline_accuracy and value < baseline_accuracy[eval_name] - args.max_drop:
+            failures.append(f"{eval_name} accuracy {baseline_accuracy[eval_name]:.4f} -> {value:.4f}")
+    if failures:
+        for failure in failures:
+            print(f"(REJECTED) {failure}")
+        print(f"Model is not published. Built model is kept in {staging_root}")
+        sys.exit(1)
+
+    from model import ItnModel
+    manifest = {
+        'name': args.name,
+        'version': ItnModel.get_model_version([os.path.join(staging_root, model_dir) for model_dir in MODEL_FILES]),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'sources': {'itncls': args.cls_source, 'itn': args.itn_source},
+        'optimization_level': args.optimization_level,
+        'quantization': {'mode': args.quantization, 'arch': args.arch, 'per_channel': args.per_channel},
+        'accuracy': accuracy,
+        'baseline_accuracy': baseline_accuracy,
+        'build_seconds': build_s,
+    }
+    write_manifest(staging_root, manifest)
+    shutil.rmtree(model_root, ignore_errors=True)
+    os.replace(staging_root, model_root)
+    print(f"Published {model_root} (version {manifest['version']})")
+
+
+if __name__ == '__main__':
+    main()
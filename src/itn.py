@@ -1,36 +1,102 @@
 from exact_match import ExactMatcher
 from regex_match import RegexMatcher
 from model import ItnModel
+from config import OnnxRuntimeConfig
+from cache import ItnResultCache
+from metrics import ItnMetrics, NULL_METRICS
 from postprocess import Postprocessor
 from entity import ItnData, ItnEntity, ItnEntityStatus
-from model import ItnModel
+from itertools import islice
+from typing import Iterable, Iterator, List
+
 
 class InverseTextNormalizer:
-    def __init__(self, dict_path='./dictionary/exact_match', model_path='./model'):
-        self.exact_matcher = ExactMatcher(dict_path)
+    def __init__(self, dict_path='./dictionary/exact_match', model_path='./model', max_batch_size=32,
+                 runtime_config: OnnxRuntimeConfig = None, cache: ItnResultCache = None,
+                 exact_matcher: ExactMatcher = None, metrics: ItnMetrics = None, lazy=False, span_window: int = None,
+                 model_name: str = None):
+        """ lazy=True이면 모델은 처음 필요할 때 로드 (사전 매칭만으로 처리되는 요청은 모델 로드 없이 처리)
+        span_window가 정수이면 숫자/알파벳 표현 앞뒤 span_window개 단어만 seq2seq 모델로 변환
+        """
+        self.metrics = metrics or NULL_METRICS
+        self.exact_matcher = exact_matcher or ExactMatcher(dict_path)
         self.regex_matcher = RegexMatcher()
-        self.model = ItnModel(model_path)
+        self.model = ItnModel(model_path, max_batch_size=max_batch_size, runtime_config=runtime_config, cache=cache,
+                              metrics=self.metrics, lazy=lazy, span_window=span_window,
+                              model_name=model_name)
+        self.model.dictionary_version = self.exact_matcher.version
         self.postprocess = Postprocessor()
     
-    def process(self, text: str) -> str:
+    def warmup(self, background=False):
+        """ 모델을 로드하고 미리 수행 (background=True이면 warmup 스레드를 반환) """
+        return self.model.warmup(background=background)
+
+    def process(self, text: str, profile=False) -> str:
         """ STT 문자열을 입력받아 ITN 변환된 텍스트를 반환 """
-        data = ItnData()
-        entity = ItnEntity(idx=1, text=text)
-        data.add(entity)
-
-        data = self.process_exactmatch(data)
-        data = self.process_regexmatch(data)
-        data = self.process_model(data)
-        data = self.process_postprocess(data)
+        metrics = self.metrics
+        with metrics.profiler(profile), metrics.timer('process'):
+            data = ItnData.from_text(text)
+
+            with metrics.timer('exactmatch'):
+                data = self.process_exactmatch(data)
+            with metrics.timer('regexmatch'):
+                data = self.process_regexmatch(data)
+            with metrics.timer('model'):
+                data = self.process_model(data)
+            with metrics.timer('postprocess'):
+                data = self.process_postprocess(data)
+        if metrics.enabled:
+            self.count_entities([data])
         return data
+
+    def process_batch(self, texts: List[str], profile=False) -> List[ItnData]:
+        """ 여러 STT 문자열을 입력받아 모델 추론은 발화 간 batch로 묶어 수행 """
+        metrics = self.metrics
+        with metrics.profiler(profile), metrics.timer('process_batch'):
+            data_list = list()
+            for text in texts:
+                data = ItnData.from_text(text)
+                with metrics.timer('exactmatch'):
+                    data = self.process_exactmatch(data)
+                with metrics.timer('regexmatch'):
+                    data = self.process_regexmatch(data)
+                data_list.append(data)
+
+            with metrics.timer('model'):
+                data_list = self.process_model_batch(data_list)
+            with metrics.timer('postprocess'):
+                data_list = [self.process_postprocess(data) for data in data_list]
+        if metrics.enabled:
+            metrics.observe('utterance_batch_size', len(texts))
+            self.count_entities(data_list)
+        return data_list
+
+    def count_entities(self, data_list: List[ItnData]):
+        for data in data_list:
+            for entity in data.itn_entity_list:
+                self.metrics.count('entities', status=entity.status.name)
+
+    def process_iter(self, texts: Iterable[str], chunk_size=256) -> Iterator[ItnData]:
+        """ 입력 순서대로 chunk_size개씩 묶어 process_batch 결과를 generator로 반환 """
+        texts = iter(texts)
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                break
+            yield from self.process_batch(chunk)
     
     def process_exactmatch(self, data: ItnData) -> ItnData:
+        # 사전이 reload된 경우 모델 캐시 키의 사전 버전도 갱신
+        self.model.dictionary_version = self.exact_matcher.version
         entities = data.itn_entity_list
         matched_entities = self.exact_matcher.process(entities)
         data.itn_entity_list = matched_entities
         return data
     
     def process_regexmatch(self, data: ItnData) -> ItnData:
+        entities = data.itn_entity_list
+        matched_entities = self.regex_matcher.process(entities)
+        data.itn_entity_list = matched_entities
         return data
     
     def process_model(self, data: ItnData) -> ItnData:
@@ -39,15 +105,56 @@ class InverseTextNormalizer:
         data.itn_entity_list = converted_entities
         return data
 
+    def process_model_batch(self, data_list: List[ItnData]) -> List[ItnData]:
+        entities_list = [data.itn_entity_list for data in data_list]
+        converted_entities_list = self.model.process_batch(entities_list)
+        for data, converted_entities in zip(data_list, converted_entities_list):
+            data.itn_entity_list = converted_entities
+        return data_list
+
     def process_postprocess(self, data: ItnData) -> ItnData:
         return data
 
 
 if __name__ == '__main__':
-    converter = InverseTextNormalizer()
-    text = '에스유제이제이 아이엔아이팔팔 골뱅이 네이버 닷컴이요'
-    itn_result = converter.process(text)
-    print(itn_result)
-    for entity in itn_result.itn_entity_list:
-        print(entity)
-    print(repr(itn_result))
+    import os
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inverse Text Normalization')
+    parser.add_argument('texts', nargs='*', help="입력 문자열 ('-'이면 표준 입력에서 한 줄씩 읽음)")
+    parser.add_argument('--dict-path', default='./dictionary/exact_match')
+    parser.add_argument('--model-path', default='./model')
+    parser.add_argument('--model-name', default=None, help='model-path 아래 배포된 모델 이름 (src/export.py)')
+    parser.add_argument('--workers', type=int, default=0, help='0이면 단일 프로세스로 수행')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--span-window', type=int, default=None, help='숫자/알파벳 표현 앞뒤 단어 수 (지정하면 해당 구간만 seq2seq 모델로 변환)')
+    args = parser.parse_args()
+
+    if not args.texts:
+        converter = InverseTextNormalizer(args.dict_path, args.model_path, model_name=args.model_name)
+        text = '에스유제이제이 아이엔아이팔팔 골뱅이 네이버 닷컴이요'
+        itn_result = converter.process(text)
+        print(itn_result)
+        for entity in itn_result.itn_entity_list:
+            print(entity)
+        print(repr(itn_result))
+        sys.exit(0)
+
+    if args.texts == ['-']:
+        texts = (line.rstrip('\n') for line in sys.stdin)
+    else:
+        texts = args.texts
+
+    if args.workers > 0:
+        from worker_pool import ItnWorkerPool
+        model_path = os.path.join(args.model_path, args.model_name) if args.model_name else args.model_path
+        with ItnWorkerPool(args.dict_path, model_path, num_workers=args.workers,
+                           max_batch_size=args.batch_size, span_window=args.span_window) as pool:
+            for itn_result in pool.process_iter(texts):
+                print(itn_result)
+    else:
+        converter = InverseTextNormalizer(args.dict_path, args.model_path, max_batch_size=args.batch_size,
+                                          span_window=args.span_window, model_name=args.model_name)
+        for itn_result in converter.process_iter(texts):
+            print(itn_result)
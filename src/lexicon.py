@@ -0,0 +1,70 @@
+import re
+from typing import Iterator, List, NamedTuple
+
+# 숫자, 영어 알파벳을 읽은 한글 표현
+SINO_NUMBER_WORDS = ["영", "공", "일", "이", "삼", "사", "오", "육", "칠", "팔", "구", "십"]
+NATIVE_NUMBER_WORDS = ["하나", "둘", "셋", "넷", "다섯", "여섯", "일곱", "여덟", "아홉", "열"]
+ALPHABET_WORDS = ["에이", "비", "씨", "디", "이", "에프", "지", "에이치", "아이", "제이", "케이", "엘", "엔", "엠",
+                  "오", "피", "큐", "알", "에스", "티", "유", "브이", "더블유", "엑스", "와이", "제트", "앳"]
+
+
+class LexiconMatch(NamedTuple):
+    start: int
+    end: int
+    word: str  # 연속된 표현 구간 (ex. 삼십팔)
+    is_number: bool
+    is_alphabet: bool
+
+
+class KoreanLexiconScanner:
+    """ 숫자/알파벳 한글 표현을 미리 컴파일한 정규식으로 한 번에 탐색 (같은 위치에서는 가장 긴 표현 우선)
+
+    한 글자 표현(이, 사, 오, 일, 구, 지 등)은 일반 단어에도 자주 포함되므로 (ex. 감사합니다, 상담사, 이은'영이'라고)
+    연속된 표현 구간이 단어 전체이거나(ex. 칠, 하나, 삼십팔), 단어 앞에서 두 개 이상 연속되거나(ex. 오십에, 하나은행은 제외),
+    세 글자 이상인 경우(ex. 사당로'이십사'길)만 후보로 반환한다. 숫자, 알파벳으로 쓰인 구간도 후보에 포함한다.
+    """
+    word_pattern = re.compile(r'\S+')
+    written_pattern = re.compile(r'[0-9A-Za-z]+')
+
+    def __init__(self, number_words=SINO_NUMBER_WORDS + NATIVE_NUMBER_WORDS, alphabet_words=ALPHABET_WORDS):
+        self.number_words = frozenset(number_words)
+        self.alphabet_words = frozenset(alphabet_words)
+        words = sorted(self.number_words | self.alphabet_words, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(word) for word in words))
+
+    def contains(self, text) -> bool:
+        return any(True for _ in self._iter_candidates(text))
+
+    def scan(self, text) -> List[LexiconMatch]:
+        return list(self._iter_candidates(text))
+
+    def _iter_candidates(self, text) -> Iterator[LexiconMatch]:
+        for word_match in self.word_pattern.finditer(text):
+            word = word_match.group()
+            offset = word_match.start()
+            matches = list()
+            for match in self.pattern.finditer(word):
+                if matches and match.start() != matches[-1].end():
+                    yield from self._run_candidate(text, offset, word, matches)
+                    matches = list()
+                matches.append(match)
+            if matches:
+                yield from self._run_candidate(text, offset, word, matches)
+            for match in self.written_pattern.finditer(word):
+                written = match.group()
+                yield LexiconMatch(offset + match.start(), offset + match.end(), written,
+                                   any(ch.isdigit() for ch in written), any(ch.isalpha() for ch in written))
+
+    def _run_candidate(self, text, offset, word, matches) -> Iterator[LexiconMatch]:
+        """ 연속된 표현 구간이 단어 전체, 단어 앞의 두 개 이상, 세 글자 이상이면 후보로 반환 """
+        start, end = matches[0].start(), matches[-1].end()
+        is_word = (start, end) == (0, len(word))
+        if not (is_word or (start == 0 and len(matches) >= 2) or end - start >= 3):
+            return
+        entries = [match.group() for match in matches]
+        yield LexiconMatch(offset + start, offset + end, text[offset+start:offset+end],
+                           any(entry in self.number_words for entry in entries),
+                           any(entry in self.alphabet_words for entry in entries))
+
+
+default_scanner = KoreanLexiconScanner()
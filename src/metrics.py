@@ -0,0 +1,155 @@
+import time
+import pstats
+import random
+import cProfile
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Tuple
+
+
+class ItnMetrics:
+    """ ITN 파이프라인 단계별 시간, entity/분류 결과 개수, batch 크기, token 수 수집
+
+    - timer(stage): 단계별 수행 시간 (초)
+    - count(name, **labels): 개수 (ex. entities{status="MODEL"}, classifier{reason="length"})
+    - observe(name, value): 값 분포 (ex. batch 크기, token 수)
+    기록할 때마다 callback(kind, name, value, labels)을 호출하며 to_prometheus()로 Prometheus text 형식을 반환
+    """
+    enabled = True
+
+    def __init__(self, prefix='itn', profile_sample_rate=0.0):
+        self.prefix = prefix
+        self.profile_sample_rate = profile_sample_rate  # 요청 중 cProfile을 수행할 비율
+        self.last_profile = None
+        self.callbacks = list()
+        self.profile_callbacks = list()
+        self._counters: Dict[Tuple[str, Tuple], float] = dict()
+        self._observations: Dict[Tuple[str, Tuple], list] = dict()  # [count, sum, max]
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable):
+        self.callbacks.append(callback)
+
+    def add_profile_callback(self, callback: Callable):
+        """ callback(pstats.Stats) """
+        self.profile_callbacks.append(callback)
+
+    def _emit(self, kind, name, value, labels):
+        for callback in self.callbacks:
+            callback(kind, name, value, labels)
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        if self.callbacks:
+            self._emit('count', name, value, labels)
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            observation = self._observations.get(key)
+            if observation is None:
+                self._observations[key] = [1, value, value]
+            else:
+                observation[0] += 1
+                observation[1] += value
+                observation[2] = max(observation[2], value)
+        if self.callbacks:
+            self._emit('observe', name, value, labels)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start, stage=stage)
+
+    def profiler(self, profile=False):
+        """ profile=True이거나 profile_sample_rate 확률로 요청 수행 중 cProfile을 수행 """
+        if profile or (self.profile_sample_rate > 0 and random.random() < self.profile_sample_rate):
+            return self._profile()
+        return nullcontext()
+
+    @contextmanager
+    def _profile(self):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self.last_profile = pstats.Stats(profiler)
+            for callback in self.profile_callbacks:
+                callback(self.last_profile)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+
+    def snapshot(self):
+        with self._lock:
+            counters = {(name, labels): value for (name, labels), value in self._counters.items()}
+            observations = {key: tuple(value) for key, value in self._observations.items()}
+        return {
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in counters.items()],
+            'observations': [{'name': name, 'labels': dict(labels), 'count': count, 'sum': total, 'max': maximum}
+                             for (name, labels), (count, total, maximum) in observations.items()],
+        }
+
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+    def to_prometheus(self):
+        lines = list()
+        with self._lock:
+            counters = sorted(self._counters.items())
+            observations = sorted(self._observations.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f'{self.prefix}_{name}_total'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} counter')
+                typed.add(metric)
+            lines.append(f'{metric}{self._format_labels(labels)} {value}')
+        for (name, labels), (count, total, _) in observations:
+            metric = f'{self.prefix}_{name}'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} summary')
+                typed.add(metric)
+            lines.append(f'{metric}_count{self._format_labels(labels)} {count}')
+            lines.append(f'{metric}_sum{self._format_labels(labels)} {total}')
+        for (name, labels), (_, _, maximum) in observations:
+            metric = f'{self.prefix}_{name}_max'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} gauge')
+                typed.add(metric)
+            lines.append(f'{metric}{self._format_labels(labels)} {maximum}')
+        return '\n'.join(lines) + '\n'
+
+
+class NullMetrics:
+    """ 수집하지 않는 metrics (기본값) """
+    enabled = False
+    _null_context = nullcontext()
+
+    def count(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, **labels):
+        pass
+
+    def timer(self, stage):
+        return self._null_context
+
+    def profiler(self, profile=False):
+        return self._null_context
+
+
+NULL_METRICS = NullMetrics()
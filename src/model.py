@@ -2,77 +2,290 @@ import re
 import os
 import time
 import pickle
-import torch
+import hashlib
 import enum
-import onnxruntime
-from typing import List
-from transformers import AutoTokenizer
-from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
-
+import bisect
+import threading
+import numpy as np
+from typing import List, NamedTuple, Set, Tuple
+
+from cache import ItnResultCache
+from config import OnnxRuntimeConfig
+from metrics import ItnMetrics, NULL_METRICS
 from entity import ItnEntity, ItnEntityStatus
+from lexicon import SINO_NUMBER_WORDS, NATIVE_NUMBER_WORDS, ALPHABET_WORDS, default_scanner
 
 
 class ItnModel:
     has_digit_alpha_email_pattern = r'[0-9A-Za-z@\.]'
-
-    def __init__(self, model_path):
-        itn_cls_model_path = os.path.join(model_path, 'itncls')
-        itn_model_path = os.path.join(model_path, 'itn')
-        self.itn_cls_model = ItnSequenceClassificationModel(model_path=itn_cls_model_path)
-        self.itn_model = ItnSeq2SeqModel(model_path=itn_model_path)
-
-        self.set_onnx_session_options()
-
-    def set_onnx_session_options(self):
-        session_options = onnxruntime.SessionOptions()
-        session_options.intra_op_num_threads = 3
-        session_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
-        session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # warmup에 사용하는 발화 (분류 모델 세션을 수행하는 문장, seq2seq 모델을 수행하는 문장)
+    warmup_cls_texts = ['네 확인 부탁드립니다', '잠시만 기다려 주시면 상담 도와드릴게요']
+    warmup_seq2seq_texts = ['공일공 일이삼사 오육칠팔', '에스유제이제이 골뱅이 네이버 닷컴']
+    lexicon_scanner = default_scanner
+    word_pattern = re.compile(r'\S+')
+
+    def __init__(self, model_path, max_batch_size=32, runtime_config: OnnxRuntimeConfig = None,
+                 cache: ItnResultCache = None, metrics: ItnMetrics = None, lazy=False, span_window: int = None,
+                 model_name: str = None):
+        """ model_name이 있으면 model_path/model_name의 모델을 로드 (src/export.py로 배포한 모델)
+        lazy=True이면 transformers import와 ORT 세션 생성을 각 모델이 처음 필요할 때 수행
+        span_window가 정수이면 숫자/알파벳 표현이 있는 단어와 앞뒤 span_window개 단어만 seq2seq 모델로 변환
+        """
+        self.max_batch_size = max_batch_size
+        self.span_window = span_window
+        if model_name:
+            model_path = os.path.join(model_path, model_name)
+        self.metrics = metrics or NULL_METRICS
+        self.runtime_config = runtime_config or OnnxRuntimeConfig.from_env()
+        self.cache = cache
+        self.dictionary_version = ''  # 캐시 키에 포함되는 사전 버전 (InverseTextNormalizer가 설정)
+        self.itn_cls_model_path = os.path.join(model_path, 'itncls')
+        self.itn_model_path = os.path.join(model_path, 'itn')
+        self.version = self.get_model_version([self.itn_cls_model_path, self.itn_model_path])
+        self._itn_cls_model = None
+        self._itn_model = None
+        self._load_lock = threading.Lock()
+        self._warmup_thread = None
+        if not lazy:
+            self.load()
+
+    @property
+    def itn_cls_model(self) -> 'ItnSequenceClassificationModel':
+        self._wait_warmup()
+        if self._itn_cls_model is None:
+            with self._load_lock:
+                if self._itn_cls_model is None:
+                    with self.metrics.timer('load_classifier'):
+                        model = ItnSequenceClassificationModel(model_path=self.itn_cls_model_path,
+                                                               runtime_config=self.runtime_config)
+                    model.metrics = self.metrics
+                    self._itn_cls_model = model
+        return self._itn_cls_model
+
+    @property
+    def itn_model(self) -> 'ItnSeq2SeqModel':
+        self._wait_warmup()
+        if self._itn_model is None:
+            with self._load_lock:
+                if self._itn_model is None:
+                    with self.metrics.timer('load_seq2seq'):
+                        model = ItnSeq2SeqModel(model_path=self.itn_model_path, runtime_config=self.runtime_config)
+                    model.metrics = self.metrics
+                    self._itn_model = model
+        return self._itn_model
+
+    @property
+    def loaded(self):
+        return self._itn_cls_model is not None and self._itn_model is not None
+
+    def load(self):
+        self.itn_cls_model
+        self.itn_model
+
+    def _wait_warmup(self):
+        # background warmup 중에는 warmup 스레드가 모델을 로드하고 수행하므로 끝날 때까지 대기
+        thread = self._warmup_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def warmup(self, background=False):
+        """ 두 모델을 로드하고 batch 크기 1, max_batch_size의 입력으로 미리 수행 (첫 요청의 지연 방지)
+
+        background=True이면 스레드에서 수행하고 스레드를 반환하며, 그동안 모델이 필요 없는 요청(사전 매칭 등)은
+        바로 처리되고 모델이 필요한 요청은 warmup이 끝날 때까지 대기한다.
+        """
+        if background:
+            thread = threading.Thread(target=self._warmup, name='itn-warmup', daemon=True)
+            self._warmup_thread = thread
+            thread.start()
+            return thread
+        self._warmup()
+
+    def _warmup(self):
+        try:
+            with self.metrics.timer('warmup'):
+                for texts in (self.warmup_cls_texts, self.warmup_seq2seq_texts):
+                    batch = (texts * self.max_batch_size)[:self.max_batch_size]
+                    self.itn_cls_model.inference_batch(texts[:1])
+                    self.itn_cls_model.inference_batch(batch)
+                self.itn_model.inference_batch(self.warmup_seq2seq_texts[:1])
+                self.itn_model.inference_batch((self.warmup_seq2seq_texts * self.max_batch_size)[:self.max_batch_size])
+        finally:
+            self._warmup_thread = None
+
+    @staticmethod
+    def get_model_version(model_paths):
+        """ 모델 설정 파일과 ONNX 파일 내용으로 모델 버전을 계산 (모델 로드 시 한 번 수행) """
+        sha = hashlib.sha1()
+        for model_path in model_paths:
+            for filename in sorted(os.listdir(model_path)):
+                if not filename.endswith(('.json', '.onnx')):
+                    continue
+                sha.update(filename.encode('utf8'))
+                with open(os.path.join(model_path, filename), 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 20), b''):
+                        sha.update(block)
+        return sha.hexdigest()[:12]
+
+    def cache_key(self, entity: ItnEntity):
+        return (self.version, self.dictionary_version, entity.itn_text.replace(' ', ''))
+
+    def apply_result(self, entity: ItnEntity, result, itn_text=None):
+        if result == ItnClsStatus.DO_ITN:
+            # 숫자나 영어 변환이 없으면 원문을 사용 (띄어쓰기 오보정 방지)
+            if not self.is_converted(itn_text):
+                itn_text = entity.text
+            entity.itn_text = itn_text
+        else:
+            entity.itn_text = entity.text
+        entity.status = ItnEntityStatus.MODEL
 
     def is_converted(self, text):
         if re.search(self.has_digit_alpha_email_pattern, text):
             return True
         return False
 
-    def process(self, entities: List[ItnEntity]) -> List[ItnEntity]:
-        entity_list = list()
-        entities_to_model = list()
-        for entity in entities:
-            status = entity.status
-            if status != ItnEntityStatus.INIT:
-                entity_list.append(entity)
-                continue
-
-            origin_text = entity.text
-            input_text = entity.itn_text
-
-            # ITN 모델로 변환 여부를 먼저 결정
-            result = self.itn_cls_model.inference(input_text)
-            if result == ItnClsStatus.DO_ITN:
-                entities_to_model.append(entity)
-                continue
-            
-            entity.itn_text = origin_text
-            entity.status = ItnEntityStatus.MODEL
-            entity_list.append(entity)
-        
-        # batch 처리가 속도 빠름
-        if entities_to_model:
-            text_list = [entity.itn_text for entity in entities_to_model]
-            itn_text_list = self.itn_model.inference_batch(text_list)
-            for itn_text, entity in zip(itn_text_list, entities_to_model):
-                # 숫자나 영어 변환이 없으면 원문을 사용 (띄어쓰기 오보정 방지)
-                if not self.is_converted(itn_text):
-                    itn_text = entity.text
-
-                entity.itn_text = itn_text
-                entity.status = ItnEntityStatus.MODEL
-                entity_list.append(entity)
+    def find_windows(self, text) -> List[Tuple[int, int]]:
+        """ 숫자/알파벳 한글 표현이 있는 단어와 앞뒤 span_window개 단어의 (start, end) 구간 (겹치거나 붙은 구간은 병합)
+
+        일반 단어 안의 한 글자 표현(ex. 상담사)은 구간을 만들지 않도록 lexicon_scanner의 후보(표현으로 이루어진 단어, 숫자/알파벳)만 사용
+        """
+        words = [(match.start(), match.end()) for match in self.word_pattern.finditer(text)]
+        word_ends = [end for _, end in words]
+        windows = list()
+        for match in self.lexicon_scanner.scan(text):
+            first = max(0, bisect.bisect_right(word_ends, match.start) - self.span_window)
+            last = min(len(words) - 1, bisect.bisect_left(word_ends, match.end) + self.span_window)
+            if windows and first <= windows[-1][1] + 1:
+                windows[-1][1] = max(windows[-1][1], last)
+            else:
+                windows.append([first, last])
+        return [(words[first][0], words[last][1]) for first, last in windows]
+
+    def split_windows(self, entity: ItnEntity) -> List[Tuple[ItnEntity, bool]]:
+        """ entity를 (sub entity, seq2seq 변환 대상 여부) 리스트로 분리 (구간이 없거나 전체이면 entity 그대로) """
+        text = entity.text
+        windows = self.find_windows(text)
+        if not windows or windows == [(0, len(text))]:
+            return [(entity, True)]
+
+        pieces = list()
+        prev_end = 0
+        for start, end in windows:
+            if start > prev_end:
+                pieces.append((entity.sub_entity(prev_end, start, idx=entity.idx), False))
+            pieces.append((entity.sub_entity(start, end, idx=entity.idx), True))
+            prev_end = end
+        if prev_end < len(text):
+            pieces.append((entity.sub_entity(prev_end, len(text), idx=entity.idx), False))
+
+        # 분리 전 entity의 양쪽 공백 유지
+        pieces[0][0].blank_l |= entity.blank_l
+        pieces[-1][0].blank_r |= entity.blank_r
+        return pieces
 
-        # entity 순서대로 정렬
-        entity_list = sorted(entity_list, key=lambda e: e.idx)
-        # breakpoint()
-        return entity_list
+    def process(self, entities: List[ItnEntity]) -> List[ItnEntity]:
+        return self.process_batch([entities])[0]
+
+    def process_batch(self, entities_list: List[List[ItnEntity]]) -> List[List[ItnEntity]]:
+        """ 여러 발화의 entity를 모아 모델을 한 번에 수행하고, 발화별 entity 리스트로 반환 """
+        return self.decode_batch(self.classify_batch(entities_list))
+
+    def classify_batch(self, entities_list: List[List[ItnEntity]]) -> 'ItnModelBatch':
+        """ 캐시 조회와 분류 모델을 수행하고 seq2seq 모델로 변환할 entity를 모음 (decode_batch와 다른 스레드에서 수행 가능) """
+        entity_lists = [list() for _ in entities_list]
+        entities_to_cls = list()  # (발화 index, entity)
+        entities_to_model = list()  # (발화 index, entity)
+        for data_idx, entities in enumerate(entities_list):
+            for entity in entities:
+                status = entity.status
+                if status != ItnEntityStatus.INIT:
+                    entity_lists[data_idx].append(entity)
+                    continue
+
+                # 캐시에 있으면 분류 모델, seq2seq 모델 모두 수행하지 않음
+                if self.cache is not None:
+                    cached = self.cache.get(self.cache_key(entity))
+                    self.metrics.count('cache', result='miss' if cached is None else 'hit')
+                    if cached is not None:
+                        self.apply_result(entity, *cached)
+                        entity_lists[data_idx].append(entity)
+                        continue
+
+                entities_to_cls.append((data_idx, entity))
+
+        # ITN 모델로 변환 여부를 먼저 결정 (분류 모델도 batch로 수행)
+        for start in range(0, len(entities_to_cls), self.max_batch_size):
+            batch = entities_to_cls[start:start+self.max_batch_size]
+            with self.metrics.timer('classifier'):
+                results = self.itn_cls_model.inference_batch([entity.itn_text for _, entity in batch])
+            for result, (data_idx, entity) in zip(results, batch):
+                if result == ItnClsStatus.DO_ITN:
+                    entities_to_model.append((data_idx, entity))
+                    continue
+
+                if self.cache is not None:
+                    self.cache.put(self.cache_key(entity), (result, None))
+                self.apply_result(entity, result)
+                entity_lists[data_idx].append(entity)
+
+        # span_window 모드에서는 숫자/알파벳 표현 주변 구간만 seq2seq 모델로 변환하고 나머지는 원문 유지
+        split_data = set()
+        if self.span_window is not None:
+            windows_to_model = list()
+            for data_idx, entity in entities_to_model:
+                pieces = self.split_windows(entity)
+                if len(pieces) > 1:
+                    split_data.add(data_idx)
+                    self.metrics.count('span_windows', value=sum(to_model for _, to_model in pieces), result='split')
+                else:
+                    self.metrics.count('span_windows', result='whole')
+                for piece, to_model in pieces:
+                    if not to_model:
+                        self.apply_result(piece, ItnClsStatus.DO_NOT_ITN)
+                        entity_lists[data_idx].append(piece)
+                        continue
+                    if self.cache is not None and len(pieces) > 1:
+                        cached = self.cache.get(self.cache_key(piece))
+                        self.metrics.count('cache', result='miss' if cached is None else 'hit')
+                        if cached is not None:
+                            self.apply_result(piece, *cached)
+                            entity_lists[data_idx].append(piece)
+                            continue
+                    windows_to_model.append((data_idx, piece))
+            entities_to_model = windows_to_model
+        return ItnModelBatch(entity_lists, entities_to_model, split_data)
+
+    def decode_batch(self, model_batch: 'ItnModelBatch') -> List[List[ItnEntity]]:
+        """ classify_batch에서 모은 entity를 seq2seq 모델로 변환하고 발화별 entity 리스트로 반환 """
+        entity_lists, entities_to_model, split_data = model_batch
+
+        # batch 처리가 속도 빠름 (batch 크기는 max_batch_size로 제한)
+        for start in range(0, len(entities_to_model), self.max_batch_size):
+            batch = entities_to_model[start:start+self.max_batch_size]
+            # 긴 entity를 공백 위치에서 분리할 수 있도록 공백이 있는 원문을 전달 (모델 입력은 공백 제거)
+            text_list = [entity.text for _, entity in batch]
+            with self.metrics.timer('seq2seq'):
+                itn_text_list = self.itn_model.inference_batch(text_list)
+            for itn_text, (data_idx, entity) in zip(itn_text_list, batch):
+                if self.cache is not None:
+                    self.cache.put(self.cache_key(entity), (ItnClsStatus.DO_ITN, itn_text))
+                self.apply_result(entity, ItnClsStatus.DO_ITN, itn_text)
+                entity_lists[data_idx].append(entity)
+
+        # entity 순서대로 정렬 (구간으로 분리된 entity는 원문 위치 순서로 정렬하고 idx를 다시 매김)
+        for data_idx, entity_list in enumerate(entity_lists):
+            entity_list.sort(key=lambda e: (e.idx, e.start))
+            if data_idx in split_data:
+                for idx, entity in enumerate(entity_list, start=entity_list[0].idx):
+                    entity.idx = idx
+        return entity_lists
+
+
+class ItnModelBatch(NamedTuple):
+    entity_lists: List[List[ItnEntity]]  # 발화별 변환이 끝난 entity
+    entities_to_model: List[Tuple[int, ItnEntity]]  # seq2seq 모델로 변환할 (발화 index, entity)
+    split_data: Set[int]  # span_window로 entity가 분리된 발화 index
 
 
 class ItnClsStatus(enum.Enum):
@@ -81,21 +294,34 @@ class ItnClsStatus(enum.Enum):
 
 
 class ItnSequenceClassificationModel:
-    num_list1 = ["영", "공", "일","이","삼","사","오","육","칠","팔","구","십"]
-    num_list2 = ["하나","둘","셋","넷","다섯","여섯","일곱","여덟","아홉","열"]
-    alpha_list = ["에이","비","씨","디","이","에프","지","에이치","아이","제이","케이","엘","엔","엠",
-                     "오","피","큐","알","에스","티","유","브이","더블유","엑스","와이","제트","앳"]
-
-    def __init__(self, model_path):
+    num_list1 = SINO_NUMBER_WORDS
+    num_list2 = NATIVE_NUMBER_WORDS
+    alpha_list = ALPHABET_WORDS
+    lexicon_scanner = default_scanner
+    metrics = NULL_METRICS
+
+    def __init__(self, model_path, runtime_config: OnnxRuntimeConfig = None):
+        from transformers import AutoTokenizer
+        runtime_config = runtime_config or OnnxRuntimeConfig.from_env()
         self.max_input_length = 200
         self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self.itn_cls_model = ORTModelForSequenceClassification.from_pretrained(model_path)
+        session_options = runtime_config.to_session_options(model_name='itncls')
+        if runtime_config.backend == 'onnxruntime':
+            from onnx_backend import OnnxSequenceClassifier
+            self.itn_cls_model = OnnxSequenceClassifier(model_path, session_options=session_options,
+                                                        provider=runtime_config.provider)
+        else:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            self.itn_cls_model = ORTModelForSequenceClassification.from_pretrained(
+                model_path,
+                session_options=session_options,
+                provider=runtime_config.provider,
+            )
                                 
     def inference(self, text):
         if len(text) > self.max_input_length:
             raise ValueError(f'The input length must not exceed the max_input_length ({self.max_input_length})')
-        text = text + " < es >"
-        inputs = self.tokenizer(text, return_tensors="pt")
+        inputs = self.tokenizer(text + " < es >", return_tensors="np")
 
         # 긴 입력 텍스트는 ITN 수행
         input_length = len(inputs.input_ids[0])
@@ -103,111 +329,204 @@ class ItnSequenceClassificationModel:
             return ItnClsStatus.DO_ITN
 
         # 숫자, 영어에 해당하는 한글이 포함되는 입력 텍스트는 ITN 수행
+        # (" < es >"의 알파벳은 입력이 아니므로 원문으로 확인)
         itncls_tag = self.character_check(text)
         if itncls_tag == 1:
             return ItnClsStatus.DO_ITN
 
         # ITN 여부를 판단
-        inputs["token_type_ids"] = torch.tensor([inputs["input_ids"].shape[-1]*[0]])
+        inputs["token_type_ids"] = np.zeros_like(inputs["input_ids"])
         outputs = self.itn_cls_model(**inputs)
         logits = outputs.logits
-        itncls_tag = torch.argmax(logits, dim=-1).tolist()[0]
+        itncls_tag = np.argmax(logits, axis=-1).tolist()[0]
 
         if itncls_tag == 1:
             return ItnClsStatus.DO_ITN
         else:
             return ItnClsStatus.DO_NOT_ITN
     
+    def inference_batch(self, text_list: List[str]) -> List[ItnClsStatus]:
+        """ 행별 ITN 여부 (max_input_length보다 긴 행은 예외 없이 ITN 수행으로 판단하여 batch의 다른 행에 영향을 주지 않음) """
+        results = [None] * len(text_list)
+        rows = list()
+        for row, text in enumerate(text_list):
+            if len(text) > self.max_input_length:
+                results[row] = ItnClsStatus.DO_ITN
+                self.metrics.count('classifier', reason='length')
+            else:
+                rows.append(row)
+        if not rows:
+            return results
+        text_list = [text_list[row] for row in rows]
+
+        # 긴 입력 텍스트, 숫자/영어에 해당하는 한글이 포함되는 입력 텍스트(" < es >" 제외한 원문 기준)는 ITN 수행
+        with self.metrics.timer('classifier_tokenize'):
+            inputs = self.tokenizer([text + " < es >" for text in text_list], padding='longest', return_tensors="np")
+        input_lengths = inputs["attention_mask"].sum(axis=-1).tolist()
+        rows_to_model = list()  # tokenize한 입력의 index
+        for pos, (row, text, input_length) in enumerate(zip(rows, text_list, input_lengths)):
+            if input_length > 256:
+                results[row] = ItnClsStatus.DO_ITN
+                self.metrics.count('classifier', reason='length')
+            elif self.character_check(text) == 1:
+                results[row] = ItnClsStatus.DO_ITN
+                self.metrics.count('classifier', reason='character_check')
+            else:
+                rows_to_model.append(pos)
+
+        # 나머지 입력만 모아 한 번에 ITN 여부를 판단
+        if rows_to_model:
+            max_length = max(input_lengths[pos] for pos in rows_to_model)
+            model_inputs = {
+                "input_ids": inputs["input_ids"][rows_to_model, :max_length],
+                "attention_mask": inputs["attention_mask"][rows_to_model, :max_length],
+            }
+            model_inputs["token_type_ids"] = np.zeros_like(model_inputs["input_ids"])
+            with self.metrics.timer('classifier_session'):
+                outputs = self.itn_cls_model(**model_inputs)
+            itncls_tags = np.argmax(outputs.logits, axis=-1).tolist()
+            for pos, itncls_tag in zip(rows_to_model, itncls_tags):
+                results[rows[pos]] = ItnClsStatus.DO_ITN if itncls_tag == 1 else ItnClsStatus.DO_NOT_ITN
+            self.metrics.count('classifier', value=len(rows_to_model), reason='model')
+            self.metrics.observe('classifier_batch_size', len(rows_to_model))
+            self.metrics.observe('classifier_input_tokens', sum(input_lengths[pos] for pos in rows_to_model))
+        return results
+
     def character_check(self, text):
-        itncls_tag = 0
-        for char in text:
-            if char in self.num_list1:
-                itncls_tag = 1
-                return itncls_tag
-            
-        for char in text:
-            if char in self.num_list2:
-                itncls_tag = 1
-                return itncls_tag
-            
-        for char in text:
-            if char in self.alpha_list:
-                itncls_tag = 1
-                return itncls_tag
-            
-        return itncls_tag
+        """ 숫자, 영어에 해당하는 한글 표현(여러 글자 표현 포함)이 있으면 1 """
+        return 1 if self.lexicon_scanner.contains(text) else 0
 
 
 class ItnSeq2SeqModel:
-    def __init__(self, model_path):
-        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self.itn_model = ORTModelForSeq2SeqLM.from_pretrained(model_path)
-        self.length = 128
-        
-    def _find_closest_number(self, target, numbers):   
-        numbers = [number for number in numbers if target > number]
+    metrics = NULL_METRICS
 
-        if len(numbers) > 0:
-            closest = min(numbers, key=lambda x: abs(x - target))
-            return closest 
+    def __init__(self, model_path, runtime_config: OnnxRuntimeConfig = None):
+        from transformers import AutoTokenizer
+        runtime_config = runtime_config or OnnxRuntimeConfig.from_env()
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        if runtime_config.backend == 'onnxruntime':
+            from onnx_backend import OnnxSeq2SeqGenerator
+            self.return_tensors = 'np'
+            # 세션마다 session_options를 만들어 encoder, decoder별로 최적화 graph를 저장
+            self.itn_model = OnnxSeq2SeqGenerator(
+                model_path,
+                session_options_factory=lambda name: runtime_config.to_session_options(model_name=f'itn_{name}'),
+                provider=runtime_config.provider,
+            )
         else:
-            return 0
-
-    def _split_sentences(self, sentence, length):
-        if len(sentence) <= length:
-            #logger.info(f"[Inverse Text Normalization Model] sentence length: {len(sentence)}")
-            return [sentence]
-
-        pattern = " "
-        closest_numbers = []
-
-        for target_num in range(0, len(sentence), length):
-            matches = re.finditer(pattern, sentence)
-            indices = [match.start() for match in matches]
-
-            if indices == []:
-                return [sentence]
-
-            closest_number = self._find_closest_number(target_num, indices)
-            if closest_number not in closest_numbers:
-                closest_numbers.append(closest_number)
-            
-        closest_numbers.append(len(sentence))
-        sentences = []
-
-        idx = 0
-        for _ in range(len(closest_numbers)):
-            if idx == len(closest_numbers)-1:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+            self.return_tensors = 'pt'
+            # optimum은 encoder, decoder 세션이 같은 session_options를 공유하므로 최적화 graph는 저장하지 않음
+            if runtime_config.optimized_model_dir:
+                print("(WARNING) optimized_model_dir is not applied to the seq2seq model with the optimum backend. "
+                      "Use backend='onnxruntime' to save its optimized graphs.")
+            session_options = runtime_config.to_session_options()
+            self.itn_model = ORTModelForSeq2SeqLM.from_pretrained(
+                model_path,
+                session_options=session_options,
+                provider=runtime_config.provider,
+            )
+        # 분리된 문장의 최대 token 수 (특수 token, " < es >" 포함)
+        self.max_input_tokens = 128
+        suffix_length = len(self.tokenizer(" < es >", add_special_tokens=False)['input_ids'])
+        self.token_budget = self.max_input_tokens - suffix_length - self.tokenizer.num_special_tokens_to_add()
+        
+    def split_spans(self, sentence) -> List[Tuple[int, int]]:
+        """ 긴 문장을 공백 위치에서 max_input_tokens 이하로 분리하고 원문 기준 (start, end) 위치를 반환
+
+        공백을 제거한 문장을 한 번만 tokenize하고, token 끝 위치와 공백 위치를 bisect로 찾아 한 번에 분리한다.
+        분리 위치에서 token 경계가 달라질 수 있으므로 분리한 문장을 다시 tokenize하여 한도를 넘으면 이전 공백에서 분리한다.
+        공백 없이 토큰 한도를 넘는 단어는 분리하지 않는다.
+        """
+        pos2orig = [idx for idx, ch in enumerate(sentence) if ch != ' ']
+        # token은 한 글자 이상이므로 (문장 앞 '▁' token 제외) 글자 수가 한도 이하이면 tokenize하지 않음
+        if len(pos2orig) + 1 <= self.token_budget:
+            return [(0, len(sentence))]
+        encoding = self.tokenizer(sentence.replace(' ', ''), add_special_tokens=False, return_offsets_mapping=True)
+        token_ends = [pos2orig[end-1] + 1 for start, end in encoding['offset_mapping'] if end > start]
+        if len(token_ends) <= self.token_budget:
+            return [(0, len(sentence))]
+
+        spaces = [idx for idx, ch in enumerate(sentence) if ch == ' ']
+        spans = list()
+        start = 0
+        while start < len(sentence):
+            token_idx = bisect.bisect_right(token_ends, start)  # start 이후에 끝나는 첫 token
+            if token_idx + self.token_budget >= len(token_ends):
+                spans.append((start, len(sentence)))
                 break
+            limit = token_ends[token_idx + self.token_budget - 1]
+            space_idx = bisect.bisect_right(spaces, limit) - 1
+            if space_idx >= 0 and spaces[space_idx] > start:
+                end = spaces[space_idx]
+                while space_idx > 0 and spaces[space_idx-1] > start:
+                    if self.count_input_tokens(sentence[start:end]) <= self.max_input_tokens:
+                        break
+                    space_idx -= 1
+                    end = spaces[space_idx]
+            elif space_idx + 1 < len(spaces):
+                end = spaces[space_idx + 1]
+            else:
+                end = len(sentence)
+            spans.append((start, end))
+            start = end + 1
+        return spans
+
+    def count_input_tokens(self, sentence) -> int:
+        """ 모델 입력 token 수 (공백 제거, " < es >"와 특수 token 포함) """
+        return len(self.tokenizer(sentence.replace(' ', '') + " < es >")['input_ids'])
+
+    def _split_sentences(self, sentence):
+        return [sentence[start:end] for start, end in self.split_spans(sentence)]
 
-            sentences.append(sentence[closest_numbers[idx]:closest_numbers[idx+1]] )
-            idx += 1
-
-        return sentences    
-    
     def inference(self, text):
-        sentences = [i.replace(" ","")+" < es >" for i in self._split_sentences(text, self.length)]
-        inputs = self.tokenizer(sentences, return_tensors='pt', padding='longest')
-        # itn_ids = self.itn_model.generate(inputs["input_ids"], num_beams=1, max_length=190)
-        itn_ids = self.itn_model.generate(inputs["input_ids"], num_beams=1, do_sample=True, top_p=0.5, temperature=0.05, max_length=190)
+        sentences = [i.replace(" ","")+" < es >" for i in self._split_sentences(text)]
+        inputs = self.tokenizer(sentences, return_tensors=self.return_tensors, padding='longest')
+        if self.return_tensors == 'np':
+            itn_ids = self.itn_model.generate(inputs["input_ids"], inputs["attention_mask"], max_length=190)
+        else:
+            # itn_ids = self.itn_model.generate(inputs["input_ids"], num_beams=1, max_length=190)
+            itn_ids = self.itn_model.generate(inputs["input_ids"], num_beams=1, do_sample=True, top_p=0.5, temperature=0.05, max_length=190)
         itn_text = self.tokenizer.batch_decode(itn_ids, skip_special_tokens=True, clean_up_tokenization_spaces=True)
         itn_text = " ".join([i.replace("< es >","").strip() for i in itn_text])
         return itn_text
     
+    def count_tokens(self, ids_list):
+        """ padding을 제외한 token 수 """
+        if not isinstance(ids_list, list):
+            ids_list = ids_list.tolist()
+        pad_token_id = self.tokenizer.pad_token_id
+        return sum(sum(1 for token_id in ids if token_id != pad_token_id) for ids in ids_list)
+
     def inference_batch(self, text_list: List[str]) -> List[str]:
         input_texts = list()
         # 긴 문장은 여러 개의 텍스트로 분리
         sentence_info = list()
         for text in text_list:
-            sentences = [i.replace(" ","")+" < es >" for i in self._split_sentences(text, self.length)]
+            sentences = [i.replace(" ","")+" < es >" for i in self._split_sentences(text)]
             input_texts.extend(sentences)
             sentence_info.append(len(sentences))
         
         # tokenize and inference
-        inputs = self.tokenizer(input_texts, return_tensors='pt', padding='longest')
-        itn_ids = self.itn_model.generate(inputs["input_ids"], num_beams=1, max_length=190)
+        metrics = self.metrics
+        if self.return_tensors == 'np':
+            # 길이가 비슷한 문장끼리 묶어 padding을 줄이고, 행별 출력 길이 한도로 decoding
+            with metrics.timer('seq2seq_tokenize'):
+                inputs = self.tokenizer(input_texts)
+            with metrics.timer('seq2seq_generate'):
+                itn_ids = [ids.tolist() for ids in self.itn_model.generate_batch(inputs["input_ids"], max_length=190)]
+        else:
+            with metrics.timer('seq2seq_tokenize'):
+                inputs = self.tokenizer(input_texts, return_tensors=self.return_tensors, padding='longest')
+            with metrics.timer('seq2seq_generate'):
+                itn_ids = self.itn_model.generate(inputs["input_ids"], num_beams=1, max_length=190)
         # itn_ids = self.itn_model.generate(inputs["input_ids"], num_beams=1, do_sample=True, top_p=0.5, temperature=0.05, max_length=190)
-        itn_texts = self.tokenizer.batch_decode(itn_ids, skip_special_tokens=True, clean_up_tokenization_spaces=True)
+        with metrics.timer('seq2seq_decode'):
+            itn_texts = self.tokenizer.batch_decode(itn_ids, skip_special_tokens=True, clean_up_tokenization_spaces=True)
+        if metrics.enabled:
+            metrics.observe('seq2seq_batch_size', len(input_texts))
+            metrics.observe('seq2seq_input_tokens', self.count_tokens(inputs["input_ids"]))
+            metrics.observe('seq2seq_output_tokens', self.count_tokens(itn_ids))
         
         # 분리된 텍스트 병합하기
         itn_text_list = list()
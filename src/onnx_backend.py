@@ -0,0 +1,168 @@
+import os
+import json
+import numpy as np
+import onnxruntime
+from collections import namedtuple
+
+
+ClassifierOutput = namedtuple('ClassifierOutput', ['logits'])
+
+
+def find_onnx_file(model_path, name):
+    """ 양자화된 모델 파일을 우선으로 ONNX 파일 경로를 찾음 """
+    for filename in (f'{name}_quantized.onnx', f'{name}.onnx'):
+        filepath = os.path.join(model_path, filename)
+        if os.path.exists(filepath):
+            return filepath
+    raise FileNotFoundError(f"'{name}.onnx' does not exist in {model_path}")
+
+
+def create_session(filepath, session_options=None, provider='CPUExecutionProvider'):
+    return onnxruntime.InferenceSession(filepath, sess_options=session_options, providers=[provider])
+
+
+class OnnxSequenceClassifier:
+    """ torch 없이 ONNX Runtime 세션을 직접 수행하는 분류 모델 """
+
+    def __init__(self, model_path, session_options=None, provider='CPUExecutionProvider'):
+        self.session = create_session(find_onnx_file(model_path, 'model'), session_options, provider)
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def __call__(self, **inputs) -> ClassifierOutput:
+        feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+        logits = self.session.run(['logits'], feed)[0]
+        return ClassifierOutput(logits=logits)
+
+
+class OnnxSeq2SeqGenerator:
+    """ torch 없이 ONNX encoder/decoder 세션으로 greedy decoding을 수행하는 seq2seq 모델
+
+    decoder_with_past 모델이 있으면 KV-cache를 사용하여 매 step 마지막 token만 decoder에 입력하고,
+    EOS를 생성했거나 길이 한도에 도달한 행은 batch에서 제외하여 남은 행만 계속 decoding한다.
+    KV-cache buffer 재사용(IOBinding, 미리 할당한 buffer)은 구현하지 않았다. export된 decoder_with_past가 past와 새 key/value를
+    graph 안에서 이어 붙여 present.* 길이가 매 step 늘어나므로, 고정 크기 buffer에 쓰려면 static cache로 다시 export해야 한다.
+    따라서 ORT가 매 step present.* 출력을 새로 할당하고, 행이 제외될 때마다 남은 행의 past를 복사한다.
+    decoder_with_past 모델이 없으면 경고를 출력하고 매 step 전체 decoder를 다시 수행한다 (출력 길이의 제곱에 비례).
+    """
+
+    def __init__(self, model_path, session_options=None, provider='CPUExecutionProvider',
+                 length_ratio=2.0, length_margin=16, bucket_size=16, session_options_factory=None):
+        """ session_options_factory가 주어지면 ONNX 파일 이름(ex. 'encoder_model')별로 session_options를 생성 """
+        def load(name):
+            options = session_options_factory(name) if session_options_factory else session_options
+            return create_session(find_onnx_file(model_path, name), options, provider)
+
+        self.encoder = load('encoder_model')
+        self.decoder = load('decoder_model')
+        try:
+            self.decoder_with_past = load('decoder_with_past_model')
+        except FileNotFoundError:
+            print(f"(WARNING) 'decoder_with_past_model.onnx' does not exist in {model_path}. "
+                  "Decoding without KV-cache re-runs the full decoder every step.")
+            self.decoder_with_past = None
+        self.encoder_input_names = {model_input.name for model_input in self.encoder.get_inputs()}
+        self.decoder_input_names = {model_input.name for model_input in self.decoder.get_inputs()}
+        self.decoder_output_names = [output.name for output in self.decoder.get_outputs()]
+        if self.decoder_with_past is not None:
+            self.decoder_with_past_input_names = {model_input.name for model_input in self.decoder_with_past.get_inputs()}
+            self.decoder_with_past_output_names = [output.name for output in self.decoder_with_past.get_outputs()]
+
+        # 행별 출력 길이 한도 = min(max_length, 입력 길이 * length_ratio + length_margin)
+        self.length_ratio = length_ratio
+        self.length_margin = length_margin
+        self.bucket_size = bucket_size
+
+        with open(os.path.join(model_path, 'generation_config.json'), 'r', encoding='utf8') as f:
+            generation_config = json.load(f)
+        self.decoder_start_token_id = generation_config['decoder_start_token_id']
+        self.eos_token_id = generation_config['eos_token_id']
+        self.pad_token_id = generation_config['pad_token_id']
+        self.forced_eos_token_id = generation_config.get('forced_eos_token_id')
+
+    def encode(self, input_ids, attention_mask):
+        feed = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        feed = {name: value for name, value in feed.items() if name in self.encoder_input_names}
+        return self.encoder.run(['last_hidden_state'], feed)[0]
+
+    def generate_batch(self, input_ids_list, max_length=190):
+        """ 길이가 비슷한 입력끼리 bucket으로 묶어 generate 수행 (결과는 입력 순서대로 반환) """
+        order = sorted(range(len(input_ids_list)), key=lambda i: len(input_ids_list[i]))
+        outputs = [None] * len(input_ids_list)
+        for start in range(0, len(order), self.bucket_size):
+            bucket = order[start:start+self.bucket_size]
+            longest = max(len(input_ids_list[i]) for i in bucket)
+            input_ids = np.full((len(bucket), longest), self.pad_token_id, dtype=np.int64)
+            attention_mask = np.zeros((len(bucket), longest), dtype=np.int64)
+            for row, i in enumerate(bucket):
+                input_ids[row, :len(input_ids_list[i])] = input_ids_list[i]
+                attention_mask[row, :len(input_ids_list[i])] = 1
+            for row, output_ids in zip(bucket, self.generate(input_ids, attention_mask, max_length=max_length)):
+                outputs[row] = output_ids
+        return outputs
+
+    def generate(self, input_ids, attention_mask=None, max_length=190):
+        """ transformers의 greedy search(num_beams=1)와 같은 규칙으로 token id를 생성 """
+        input_ids = np.asarray(input_ids, dtype=np.int64)
+        if attention_mask is None:
+            attention_mask = np.ones_like(input_ids)
+        attention_mask = np.asarray(attention_mask, dtype=np.int64)
+        encoder_hidden_states = self.encode(input_ids, attention_mask)
+
+        batch_size = input_ids.shape[0]
+        input_lengths = attention_mask.sum(axis=-1)
+        max_lengths = np.minimum(max_length, np.ceil(input_lengths * self.length_ratio).astype(np.int64) + self.length_margin)
+        output_ids = np.full((batch_size, int(max_lengths.max())), self.pad_token_id, dtype=np.int64)
+        output_ids[:, 0] = self.decoder_start_token_id
+
+        active = np.arange(batch_size)  # decoding 중인 행
+        cur_len = 1
+        logits, past = self._decode(output_ids[:, :1], encoder_hidden_states, attention_mask, None)
+        while True:
+            next_tokens = np.argmax(logits[:, -1, :], axis=-1)
+            # 행별 마지막 위치에서는 forced_eos_token_id를 생성
+            if self.forced_eos_token_id is not None:
+                next_tokens = np.where(cur_len == max_lengths[active] - 1, self.forced_eos_token_id, next_tokens)
+            output_ids[active, cur_len] = next_tokens
+            cur_len += 1
+
+            finished = (next_tokens == self.eos_token_id) | (cur_len >= max_lengths[active])
+            if finished.all():
+                break
+            if finished.any():
+                keep = ~finished
+                active = active[keep]
+                encoder_hidden_states = encoder_hidden_states[keep]
+                attention_mask = attention_mask[keep]
+                if past is not None:
+                    past = {name: value[keep] for name, value in past.items()}
+
+            if past is None:
+                logits, past = self._decode(output_ids[active, :cur_len], encoder_hidden_states, attention_mask, None)
+            else:
+                logits, past = self._decode(output_ids[active, cur_len-1:cur_len], encoder_hidden_states, attention_mask, past)
+
+        return output_ids[:, :cur_len]
+
+    def _decode(self, decoder_input_ids, encoder_hidden_states, encoder_attention_mask, past):
+        """ decoder 1 step 수행 후 (logits, 다음 step에 입력할 past key/value) 반환 """
+        feed = {
+            'input_ids': decoder_input_ids,
+            'encoder_hidden_states': encoder_hidden_states,
+            'encoder_attention_mask': encoder_attention_mask,
+        }
+        if past is None:
+            session, input_names, output_names = self.decoder, self.decoder_input_names, self.decoder_output_names
+        else:
+            session, input_names, output_names = self.decoder_with_past, self.decoder_with_past_input_names, self.decoder_with_past_output_names
+            feed.update(past)
+        feed = {name: value for name, value in feed.items() if name in input_names}
+        outputs = dict(zip(output_names, session.run(output_names, feed)))
+
+        if self.decoder_with_past is None:
+            return outputs['logits'], None
+        # present.* 출력을 past_key_values.* 입력으로 그대로 사용 (cross-attention 값은 첫 step 값 유지)
+        next_past = dict(past) if past is not None else dict()
+        for name, value in outputs.items():
+            if name.startswith('present.'):
+                next_past['past_key_values.' + name[len('present.'):]] = value
+        return outputs['logits'], next_past
@@ -0,0 +1,171 @@
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Iterable, Iterator, List
+
+from entity import ItnData
+from itn import InverseTextNormalizer
+
+_STOP = object()
+
+
+class ItnPipeline:
+    """ 단계별 스레드로 요청을 처리하여 발화 간 단계를 겹쳐 수행하는 executor
+
+    match(사전/규칙 매칭) -> classify(캐시 조회, 분류 모델) -> decode(seq2seq 모델) -> postprocess 단계가
+    크기 제한 큐로 연결되며, ONNX Runtime이 GIL을 놓고 decoding하는 동안 다음 발화들의 매칭, 분류를 수행한다.
+    classify 단계는 큐에 쌓인 발화를 max_batch_size까지 모아(최대 max_wait_ms 대기) batch로 수행하며,
+    분류 모델과 seq2seq 모델은 각각 한 스레드에서만 수행된다. 요청마다 Future를 반환하고 각 단계는 입력 순서를 유지한다.
+    """
+
+    def __init__(self, converter: InverseTextNormalizer, max_batch_size=32, max_wait_ms=2, queue_size=256):
+        self.converter = converter
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue_size = queue_size
+        self.input_queue = queue.Queue(maxsize=queue_size)  # 가득 차면 submit이 대기 (backpressure)
+        self.match_queue = queue.Queue(maxsize=queue_size)
+        self.classify_queue = queue.Queue(maxsize=max(1, queue_size // max_batch_size))  # batch 단위
+        self.decode_queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._match_stage, name='itn-pipeline-match', daemon=True),
+            threading.Thread(target=self._classify_stage, name='itn-pipeline-classify', daemon=True),
+            threading.Thread(target=self._decode_stage, name='itn-pipeline-decode', daemon=True),
+            threading.Thread(target=self._postprocess_stage, name='itn-pipeline-postprocess', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ 제출된 요청을 모두 처리한 뒤 스레드를 종료 """
+        if self._closed:
+            return
+        self._closed = True
+        self.input_queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def submit(self, text: str) -> Future:
+        if self._closed:
+            raise RuntimeError('ItnPipeline is closed')
+        future = Future()
+        self.input_queue.put((text, future))
+        return future
+
+    def process_iter(self, texts: Iterable[str]) -> Iterator[ItnData]:
+        """ 입력 순서대로 결과를 반환 (처리 중인 요청 수는 queue_size로 제한) """
+        pending = deque()
+        for text in texts:
+            pending.append(self.submit(text))
+            if len(pending) >= self.queue_size:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def process_batch(self, texts: List[str]) -> List[ItnData]:
+        return list(self.process_iter(texts))
+
+    def _match_stage(self):
+        converter = self.converter
+        metrics = converter.metrics
+        while True:
+            item = self.input_queue.get()
+            if item is _STOP:
+                self.match_queue.put(_STOP)
+                return
+            text, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                data = ItnData.from_text(text)
+                with metrics.timer('exactmatch'):
+                    data = converter.process_exactmatch(data)
+                with metrics.timer('regexmatch'):
+                    data = converter.process_regexmatch(data)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            self.match_queue.put((data, future))
+
+    def _collect(self):
+        """ 매칭이 끝난 발화를 max_batch_size개 또는 max_wait 동안 모음 (종료 신호를 받으면 stop=True) """
+        batch = [self.match_queue.get()]
+        if batch[0] is _STOP:
+            return [], True
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self.match_queue.get(timeout=timeout) if timeout > 0 else self.match_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _classify_stage(self):
+        model = self.converter.model
+        metrics = self.converter.metrics
+        while True:
+            batch, stop = self._collect()
+            if batch:
+                try:
+                    with metrics.timer('classify'):
+                        model_batch = model.classify_batch([data.itn_entity_list for data, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        future.set_exception(e)
+                else:
+                    metrics.observe('pipeline_batch_size', len(batch))
+                    self.classify_queue.put((batch, model_batch))
+            if stop:
+                self.classify_queue.put(_STOP)
+                return
+
+    def _decode_stage(self):
+        model = self.converter.model
+        metrics = self.converter.metrics
+        while True:
+            item = self.classify_queue.get()
+            if item is _STOP:
+                self.decode_queue.put(_STOP)
+                return
+            batch, model_batch = item
+            try:
+                with metrics.timer('decode'):
+                    entity_lists = model.decode_batch(model_batch)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for entity_list, (data, future) in zip(entity_lists, batch):
+                data.itn_entity_list = entity_list
+                self.decode_queue.put((data, future))
+
+    def _postprocess_stage(self):
+        converter = self.converter
+        metrics = converter.metrics
+        while True:
+            item = self.decode_queue.get()
+            if item is _STOP:
+                return
+            data, future = item
+            try:
+                with metrics.timer('postprocess'):
+                    data = converter.process_postprocess(data)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            if metrics.enabled:
+                converter.count_entities([data])
+            future.set_result(data)
@@ -1,4 +1,140 @@
+import re
+from entity import ItnData, ItnEntity, ItnEntityStatus
+from typing import List, Tuple
+
+DIGITS = {'영': '0', '공': '0', '일': '1', '이': '2', '삼': '3', '사': '4', '오': '5', '육': '6', '칠': '7', '팔': '8', '구': '9'}
+UNITS = {'십': 10, '백': 100, '천': 1000}
+
+D = '[영공일이삼사오육칠팔구]'
+# 자릿수로 읽은 수 (ex. 삼십팔, 천이백) - 빈 문자열은 lookahead로 제외
+PLACE_VALUE = '(?=[일이삼사오육칠팔구십백천])(?:[이삼사오육칠팔구]?천)?(?:[이삼사오육칠팔구]?백)?(?:[이삼사오육칠팔구]?십)?[일이삼사오육칠팔구]?'
+# 시/구/군/읍/면 이름 (ex. 은평구, 서울시) - 같은 글자로 끝나는 부사는 제외
+PLACE_NAME = r'(?!(?:다시|혹시|역시|당시|동시|잠시) )[가-힣]+(?:시|구|군|읍|면)'
+# 도로명 (ex. 사당로이십사길, 종로구 세종대로, 양천구 안양천서로)
+# 조사 '로', '대로'(앞으로, 계획대로, 그대로)와 구분하기 위해 '~대로', '~[동서남북]로'는 앞에 지역 이름이 있는 경우만 허용
+ROAD_NAME = rf'(?:{PLACE_NAME} )?[가-힣]+로(?:{PLACE_VALUE}|{D}{{1,3}})번?길|{PLACE_NAME} [가-힣]+(?:대로|[동서남북]로)'
+# 건물 번호 (한 음절 숫자는 제외, ex. 삼십팔, 삼일일)
+ROAD_NUMBER = rf'(?=[이삼사오육칠팔구]?[십백천]){PLACE_VALUE}|{D}{{2,5}}'
+# 건물 번호 뒤에 오는 주소 표현 (번지, 호 등 또는 문장 끝)
+ADDRESS_NEXT = r'(?= ?(?:번지|번|호|층)| (?:입니다|이에요|예요|이요|요|이고|맞)|\s*$)'
 
 
 class RegexMatcher:
-    pass
\ No newline at end of file
+    """ 형식이 정해진 숫자 표현을 규칙으로 변환 (ITN 모델 호출 전에 수행)
+
+    규칙은 우선순위 순서이며 같은 위치에서는 앞의 규칙이 우선, 서로 겹치는 매칭은 앞의 매칭이 우선
+    - ip: 일칠이점이삼점일구이점이일칠 -> 172.23.192.217
+    - phone: 공일공 일이삼사 오육칠팔 -> 010-1234-5678
+    - road: (도로명 뒤의 두 음절 이상 건물 번호) 양천구 안양천서로 삼일일 -> 311, 사당로이십사길 삼십팔 번지 -> 38
+    - spaced_digits: (한 자리씩 띄어 읽은 4자리 이상) 팔 일 삼 칠 -> 8137
+    - digits: (붙여 읽은 6자리 이상) 칠이일이이구 -> 721229
+    """
+    rules = [
+        ('ip', rf'(?<![가-힣])({D}{{1,3}})점({D}{{1,3}})점({D}{{1,3}})점({D}{{1,3}})'),
+        ('phone', rf'(?<![가-힣])(공일[공일육칠팔구]) ?({D}{{3,4}}) ?({D}{{4}})(?! ?{D} ?{D})'),
+        ('road', rf'(?<![가-힣])(?:{ROAD_NAME}) (?P<road_number>{ROAD_NUMBER}){ADDRESS_NEXT}'),
+        ('spaced_digits', rf'(?<!\S)({D}(?: {D}){{3,}})(?!\S)'),
+        ('digits', rf'(?<![가-힣])({D}{{6,}})'),
+    ]
+
+    def __init__(self):
+        self.pattern = re.compile('|'.join(f'(?P<{name}>{rule})' for name, rule in self.rules))
+
+    @staticmethod
+    def read_digits(text):
+        """ 한 자리씩 읽은 수를 숫자로 변환 (공백 무시) """
+        return ''.join(DIGITS[ch] for ch in text if ch != ' ')
+
+    @staticmethod
+    def read_place_value(text):
+        """ 자릿수로 읽은 수를 숫자로 변환 (ex. 천이백삼십사 -> 1234) """
+        number = 0
+        digit = 0
+        for ch in text:
+            if ch in UNITS:
+                number += (digit or 1) * UNITS[ch]
+                digit = 0
+            else:
+                digit = int(DIGITS[ch])
+        return str(number + digit)
+
+    @staticmethod
+    def span(match) -> Tuple[int, int]:
+        """ 변환할 구간 (road는 도로명을 제외한 건물 번호) """
+        if match.lastgroup == 'road':
+            return match.span('road_number')
+        return match.span()
+
+    def convert(self, match) -> str:
+        name = match.lastgroup
+        text = match.group('road_number' if name == 'road' else name)
+        if name == 'ip':
+            return '.'.join(self.read_digits(part) for part in re.split('점', text))
+        if name == 'phone':
+            digits = self.read_digits(text)
+            return f'{digits[:3]}-{digits[3:-4]}-{digits[-4:]}'
+        if name == 'road' and re.search('[십백천]', text):
+            return self.read_place_value(text)
+        return self.read_digits(text)
+
+    def find(self, text) -> List[Tuple[int, int, str]]:
+        """ (start, end, 변환 문자열) 리스트 """
+        return [(*self.span(match), self.convert(match)) for match in self.pattern.finditer(text)]
+
+    def process(self, entities: List[ItnEntity], idx_start=-1) -> List[ItnEntity]:
+        if idx_start == -1:
+            idx = entities[0].idx
+        else:
+            idx = idx_start
+
+        entity_list = list()
+        for entity in entities:
+            text = entity.text
+            status = entity.status
+
+            if status != ItnEntityStatus.INIT:
+                entity.idx = idx
+                entity_list.append(entity)
+                idx += 1
+                continue
+
+            prev_text_end = 0
+            first_pos = len(entity_list)
+            matches = self.find(text)
+            if not matches:
+                entity.idx = idx
+                entity_list.append(entity)
+                idx += 1
+                continue
+
+            for text_start, text_end, itn_text in matches:
+                if text_start == prev_text_end:
+                    entity_list.append(entity.sub_entity(text_start, text_end, idx=idx, itn_text=itn_text, status=ItnEntityStatus.REGEX))
+                    idx += 1
+                elif text_start > prev_text_end:
+                    entity_list.append(entity.sub_entity(prev_text_end, text_start, idx=idx, status=status))
+                    entity_list.append(entity.sub_entity(text_start, text_end, idx=idx+1, itn_text=itn_text, status=ItnEntityStatus.REGEX))
+                    idx += 2
+                else:
+                    raise ValueError
+                prev_text_end = text_end
+
+            if prev_text_end < len(text):
+                entity_list.append(entity.sub_entity(prev_text_end, len(text), idx=idx, status=ItnEntityStatus.INIT))
+                idx += 1
+
+            # 분리 전 entity의 양쪽 공백 유지
+            entity_list[first_pos].blank_l |= entity.blank_l
+            entity_list[-1].blank_r |= entity.blank_r
+
+        return entity_list
+
+
+if __name__ == '__main__':
+    matcher = RegexMatcher()
+    data = ItnData()
+    data.add(ItnEntity(1, '아이피 주소는 일칠이점이삼점일구이점이일칠입니다'))
+    data.itn_entity_list = matcher.process(data.itn_entity_list)
+    print(data)
+    for entity in data.itn_entity_list:
+        print(entity)
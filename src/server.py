@@ -0,0 +1,220 @@
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from itn import InverseTextNormalizer
+from pipeline import ItnPipeline
+
+
+class MicroBatcher:
+    """ 요청을 큐에 모아 max_batch_size 또는 max_wait_ms 단위로 process_batch 수행 """
+
+    def __init__(self, converter: InverseTextNormalizer, max_batch_size=32, max_wait_ms=5, max_queue_size=1024):
+        self.converter = converter
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.queue = None
+        # ORT 세션은 전용 추론 스레드 하나에서만 수행
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='itn-inference')
+        self._task = None
+
+    def start(self):
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)  # 가득 차면 submit이 대기 (backpressure)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=True)
+
+    async def enqueue(self, text: str) -> asyncio.Future:
+        """ 큐에 들어갈 때까지 대기한 뒤 결과 future를 반환 (큐가 가득 차면 대기하여 backpressure) """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return future
+
+    async def submit(self, text: str) -> str:
+        return await (await self.enqueue(text))
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self._process, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for result, (_, future) in zip(results, batch):
+                if not future.done():
+                    future.set_result(result)
+
+    def _process(self, texts: List[str]) -> List[str]:
+        return [str(data) for data in self.converter.process_batch(texts)]
+
+
+class PipelineBatcher:
+    """ MicroBatcher 대신 ItnPipeline으로 요청을 처리 (매칭과 모델 추론을 단계별 스레드에서 겹쳐 수행) """
+
+    def __init__(self, pipeline: ItnPipeline):
+        self.pipeline = pipeline
+        self.semaphore = None
+
+    def start(self):
+        # 처리 중인 요청 수를 pipeline 입력 큐 크기로 제한하므로 pipeline.submit은 대기하지 않음
+        self.semaphore = asyncio.Semaphore(self.pipeline.queue_size)
+
+    async def stop(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.pipeline.close)
+
+    async def enqueue(self, text: str) -> asyncio.Future:
+        """ 처리 중인 요청이 queue_size개 미만이 될 때까지 대기한 뒤 결과 future를 반환 """
+        await self.semaphore.acquire()
+        try:
+            future = asyncio.wrap_future(self.pipeline.submit(text))
+        except Exception:
+            self.semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self.semaphore.release())
+        return future
+
+    async def submit(self, text: str) -> str:
+        return str(await (await self.enqueue(text)))
+
+
+class ItnServer:
+    """ line-delimited JSON 프로토콜 서버
+
+    요청: {"id": ..., "text": "..."}  응답: {"id": ..., "itn_text": "..."} 또는 {"id": ..., "error": "..."}
+    한 연결에서 여러 요청을 보낼 수 있으며 응답은 처리 완료 순서로 전송됨
+    batcher 큐에 요청이 들어간 뒤에 다음 요청을 읽고, 연결마다 응답하지 않은 요청은 max_pending개로 제한 (backpressure)
+    """
+
+    def __init__(self, batcher, host='127.0.0.1', port=8765, max_pending=256):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        pending = asyncio.Semaphore(self.max_pending)
+        tasks = set()
+
+        async def write(response):
+            async with lock:
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf8') + b'\n')
+                await writer.drain()
+
+        async def respond(request, future):
+            try:
+                try:
+                    response = {'id': request.get('id'), 'itn_text': str(await future)}
+                except Exception as e:
+                    response = {'id': request.get('id'), 'error': str(e)}
+                await write(response)
+            finally:
+                pending.release()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request.get('text'), str):
+                        raise ValueError("'text' must be a string")
+                except (ValueError, AttributeError) as e:
+                    await write({'id': None, 'error': f'invalid request: {e}'})
+                    continue
+                await pending.acquire()
+                try:
+                    future = await self.batcher.enqueue(request['text'])
+                except Exception as e:
+                    pending.release()
+                    await write({'id': request.get('id'), 'error': str(e)})
+                    continue
+                task = asyncio.create_task(respond(request, future))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(f"ITN server listening on {self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ITN micro-batching server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--dict-path', default='./dictionary/exact_match')
+    parser.add_argument('--model-path', default='./model')
+    parser.add_argument('--model-name', default=None, help='model-path 아래 배포된 모델 이름 (src/export.py)')
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=5)
+    parser.add_argument('--max-queue-size', type=int, default=1024)
+    parser.add_argument('--max-pending', type=int, default=256, help='연결마다 응답하지 않은 최대 요청 수')
+    parser.add_argument('--pipeline', action='store_true', help='단계별 스레드 pipeline으로 요청을 처리')
+    parser.add_argument('--span-window', type=int, default=None, help='숫자/알파벳 표현 앞뒤 단어 수 (지정하면 해당 구간만 seq2seq 모델로 변환)')
+    parser.add_argument('--lazy', action='store_true', help='모델을 처음 필요할 때 로드하여 바로 요청을 받음')
+    parser.add_argument('--warmup', choices=['none', 'sync', 'background'], default='none',
+                        help='sync: 모델 warmup 후 요청을 받음, background: 요청을 받으면서 warmup')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    converter = InverseTextNormalizer(args.dict_path, args.model_path, max_batch_size=args.max_batch_size,
+                                      lazy=args.lazy, span_window=args.span_window,
+                                      model_name=args.model_name)
+    if args.warmup != 'none':
+        converter.warmup(background=args.warmup == 'background')
+    print(f"ITN converter ready in {time.perf_counter() - start:.2f}s")
+    if args.pipeline:
+        batcher = PipelineBatcher(ItnPipeline(converter, max_batch_size=args.max_batch_size,
+                                              max_wait_ms=args.max_wait_ms, queue_size=args.max_queue_size))
+    else:
+        batcher = MicroBatcher(converter, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+                               max_queue_size=args.max_queue_size)
+    server = ItnServer(batcher, host=args.host, port=args.port, max_pending=args.max_pending)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+from typing import List, Optional, Tuple
+from entity import ItnData, ItnEntity, ItnEntityStatus
+
+
+class ItnStreamingSession:
+    """ 점점 길어지는 STT 중간 결과(partial)를 증분 처리하는 세션
+
+    확정되지 않은 부분(tail)을 ITN 처리한 결과에서, 마지막 unstable_words개 단어보다 앞에서 끝나는 entity까지를
+    확정(commit)하여 재사용하고 이후에는 그 뒤의 부분만 처리한다. (stable 단어가 min_commit_words개 이상일 때)
+    매칭되지 않은 긴 구간(INIT, MODEL entity)이 unstable 단어까지 이어지면 stable 단어의 마지막 공백에서 나누어 앞부분만 다시 처리하여 확정한다.
+    사전/규칙 매칭은 나누지 않으므로 확정 경계에 걸친 매칭(ex. 전화번호)도 전체를 한 번에 처리한 결과와 같다.
+    partial이 확정된 부분과 달라지면 (STT가 앞부분을 수정한 경우) 처음부터 다시 처리한다.
+    """
+    splittable_status = (ItnEntityStatus.INIT, ItnEntityStatus.MODEL)
+
+    def __init__(self, converter, unstable_words=3, min_commit_words=4):
+        self.converter = converter
+        self.unstable_words = unstable_words
+        self.min_commit_words = min_commit_words
+        self.reset()
+
+    def reset(self):
+        self.stable_text = ''  # 확정된 prefix (마지막은 항상 공백)
+        self.stable_entities: List[ItnEntity] = list()  # 확정된 entity (idx, 공백 표시는 병합 시 한 번만 수정)
+        self.tail_entities: List[ItnEntity] = list()  # None이면 마지막 partial의 확정되지 않은 부분을 다시 처리해야 함
+        self.partial = ''
+
+    def feed(self, partial: str) -> ItnData:
+        """ 새 partial을 입력받아 전체 ITN 결과를 반환 """
+        if not partial.startswith(self.stable_text):
+            self.reset()
+
+        tail = partial[len(self.stable_text):]
+        entities = self._process(tail)
+        data = self._result(entities)
+        commit_end, committed, self.tail_entities = self._split_commit(tail, entities)
+        if commit_end:
+            self._append(self.stable_entities, committed)
+            self.stable_text += tail[:commit_end]
+        self.partial = partial
+        return data
+
+    def finalize(self) -> ItnData:
+        """ 마지막 partial까지의 최종 결과를 반환하고 세션을 초기화 """
+        if self.tail_entities is None:
+            self.tail_entities = self._process(self.partial[len(self.stable_text):])
+        data = self._result(self.tail_entities)
+        self.reset()
+        return data
+
+    def _process(self, text: str) -> List[ItnEntity]:
+        if not text.strip():
+            return []
+        return self.converter.process(text).itn_entity_list
+
+    def _split_commit(self, tail: str, entities: List[ItnEntity]) -> Tuple[int, List[ItnEntity], Optional[List[ItnEntity]]]:
+        """ (확정할 tail 위치, 확정할 entity, 나머지 entity) - 확정할 부분이 없으면 위치는 0, entity를 나눈 경우 나머지는 None
+
+        unstable 단어 앞에서 끝나고 공백이 뒤따르는 마지막 entity까지 확정하며, unstable 단어까지 이어지는
+        INIT, MODEL entity는 stable 단어의 마지막 공백 앞부분만 다시 처리하여 함께 확정한다.
+        """
+        words = tail.split(' ')
+        num_stable_words = len(words) - self.unstable_words
+        if num_stable_words < self.min_commit_words:
+            return 0, [], entities
+        stable_end = len(' '.join(words[:num_stable_words]))
+        commit_end = 0
+        num_commit = 0
+        for pos, entity in enumerate(entities):
+            if entity.end <= stable_end:
+                if tail[entity.end:entity.end+1] == ' ':
+                    commit_end = entity.end + 1
+                    num_commit = pos + 1
+                continue
+            if entity.status in self.splittable_status:
+                cut = tail.rfind(' ', entity.start, stable_end + 1)
+                if cut > entity.start:
+                    prev_end = entities[pos-1].end if pos > 0 else 0
+                    # 앞 entity와 공백 없이 붙은 경우를 위해 앞 entity 끝부터 처리 (공백은 blank_l로 표시됨)
+                    return cut + 1, entities[:pos] + self._process(tail[prev_end:cut]), None
+            break
+        return commit_end, entities[:num_commit], entities[num_commit:]
+
+    @staticmethod
+    def _append(target: List[ItnEntity], entities: List[ItnEntity]):
+        """ idx를 이어서 매기고 이어 붙인 위치의 공백을 한 번만 표시하여 target에 추가 """
+        for pos, entity in enumerate(entities):
+            if pos == 0 and target:
+                entity.blank_l = entity.blank_l or not target[-1].blank_r
+            entity.idx = len(target) + 1
+            target.append(entity)
+
+    def _result(self, tail_entities: List[ItnEntity]) -> ItnData:
+        entities = list(self.stable_entities)
+        self._append(entities, tail_entities)
+        return ItnData(entities)
@@ -0,0 +1,101 @@
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from config import OnnxRuntimeConfig
+from entity import ItnData
+from exact_match import ExactMatcher
+
+# fork 전에 부모 프로세스에서 로드하여 워커가 copy-on-write로 공유
+_shared_exact_matcher = None
+# 워커 프로세스별 InverseTextNormalizer
+_worker_converter = None
+
+
+def _init_worker(dict_path, model_path, max_batch_size, runtime_config, span_window):
+    global _worker_converter
+    from itn import InverseTextNormalizer
+
+    # ONNX Runtime 세션은 내부 스레드 풀 때문에 fork 이후 공유할 수 없으므로 워커에서 생성
+    _worker_converter = InverseTextNormalizer(dict_path, model_path, max_batch_size=max_batch_size,
+                                              runtime_config=runtime_config, exact_matcher=_shared_exact_matcher,
+                                              span_window=span_window)
+
+
+def _process_chunk(texts: List[str]) -> List[ItnData]:
+    return _worker_converter.process_batch(texts)
+
+
+def _check_model_files(model_path):
+    """ 워커를 만들기 전에 모델 파일이 있는지 확인 (없으면 FileNotFoundError) """
+    from onnx_backend import find_onnx_file
+
+    for model_dir, names in (('itncls', ['model']), ('itn', ['encoder_model', 'decoder_model'])):
+        for name in names:
+            find_onnx_file(os.path.join(model_path, model_dir), name)
+
+
+class ItnWorkerPool:
+    """ 여러 프로세스로 InverseTextNormalizer를 수행하는 워커 풀 (입력 순서대로 결과 반환)
+
+    fork를 지원하는 환경에서는 부모 프로세스에서 사전(Aho-Corasick automaton)을 한 번만 로드하고
+    워커가 공유하며, 워커별 ORT 스레드 수는 코어 수를 워커 수로 나누어 설정한다.
+    모델 파일이 없으면 워커를 만들기 전에 FileNotFoundError, 워커 초기화가 실패하면 결과 대기 중 BrokenProcessPool이 발생한다.
+    """
+
+    def __init__(self, dict_path='./dictionary/exact_match', model_path='./model', num_workers=None,
+                 chunk_size=64, max_batch_size=32, runtime_config: OnnxRuntimeConfig = None, span_window=None):
+        global _shared_exact_matcher
+        cpu_count = os.cpu_count() or 1
+        self.num_workers = num_workers or cpu_count
+        self.chunk_size = chunk_size
+        if runtime_config is None:
+            runtime_config = OnnxRuntimeConfig.from_env(intra_op_num_threads=max(1, cpu_count // self.num_workers),
+                                                        allow_spinning=False)
+        if runtime_config.optimized_model_dir:
+            # 워커가 같은 파일에 최적화 graph를 동시에 쓰지 않도록 함
+            runtime_config = replace(runtime_config, optimized_model_dir=None)
+        _check_model_files(model_path)
+
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+            _shared_exact_matcher = ExactMatcher(dict_path)
+        else:
+            context = multiprocessing.get_context('spawn')
+        self.pool = ProcessPoolExecutor(self.num_workers, mp_context=context, initializer=_init_worker,
+                                        initargs=(dict_path, model_path, max_batch_size, runtime_config, span_window))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+    def _chunks(self, texts: Iterable[str]) -> Iterator[List[str]]:
+        texts = iter(texts)
+        while True:
+            chunk = list(islice(texts, self.chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+    def process_iter(self, texts: Iterable[str]) -> Iterator[ItnData]:
+        # 처리 중인 chunk 수를 제한하여 입력이 커도 메모리 사용량이 늘지 않도록 함
+        max_pending = self.num_workers * 2
+        pending = deque()
+        for chunk in self._chunks(texts):
+            pending.append(self.pool.submit(_process_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def process_batch(self, texts: List[str]) -> List[ItnData]:
+        return list(self.process_iter(texts))
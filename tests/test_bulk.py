@@ -0,0 +1,25 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import io
+import pytest
+from bulk import BulkNormalizer
+
+
+def upper_iter(texts):
+    for text in texts:
+        yield text.upper()
+
+
+@pytest.mark.parametrize('input_format, data, expected', [
+    ('txt', b'a\n\nb\nc\n', b'A\n\nB\nC\n'),
+    ('txt', b'\n\na\n\n', b'\n\nA\n\n'),
+    ('tsv', b'x\ta\n\ny\tb\n', b'x\ta\tX\n\ny\tb\tY\n'),
+    ('jsonl', b'{"text": "a"}\n\n{"text": "b"}\n', b'{"text": "a", "itn_text": "A"}\n\n{"text": "b", "itn_text": "B"}\n'),
+])
+def test_blank_lines_are_kept(input_format, data, expected):
+    output = io.BytesIO()
+    num_lines = BulkNormalizer(upper_iter, input_format).process(io.BytesIO(data), output)
+    assert output.getvalue() == expected
+    assert num_lines == data.count(b'\n')
@@ -0,0 +1,35 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from lexicon import default_scanner as scanner
+
+
+@pytest.mark.parametrize('text', [
+    '감사합니다',
+    '안녕하세요 상담사 이은영이라고 합니다',
+    '감사합니다 저는 상담사 이라혜였습니다',
+    '하나은행 지점이요',
+    '먼저 가입자 분 성함이 자선자 고객님 맞으실까요',
+    '네이버 닷 컴이요',
+])
+def test_common_words_not_matched(text):
+    # 한 글자 표현(사, 이, 영, 하나 등)이 일반 단어 안에 포함된 경우는 후보가 아님
+    assert not scanner.contains(text)
+    assert scanner.scan(text) == []
+
+
+@pytest.mark.parametrize('text, words', [
+    ('주소는 서울시 은평구 사당로이십사길 삼십팔 다시 칠 입니다', ['이십사', '삼십팔', '칠']),
+    ('이름은 이명희 생일은 칠이일이이구', ['칠이일이이구']),
+    ('에스유제이제이 아이엔아이팔팔 골뱅이', ['에스유제이제이', '아이엔아이팔팔']),
+    ('하나', ['하나']),
+    ('오십에 주세요', ['오십']),
+    ('abc 123', ['abc', '123']),
+])
+def test_number_alphabet_words_matched(text, words):
+    matches = scanner.scan(text)
+    assert [match.word for match in matches] == words
+    assert all(text[match.start:match.end] == match.word for match in matches)
+    assert scanner.contains(text)
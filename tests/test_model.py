@@ -0,0 +1,168 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+import numpy as np
+import pytest
+
+transformers = pytest.importorskip('transformers')
+from model import ItnSeq2SeqModel
+
+ITN_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'model', 'itn')
+TC_PATH = os.path.join(os.path.dirname(__file__), '..', 'tc.csv')
+
+
+@pytest.fixture(scope='module')
+def seq2seq_model():
+    """ ONNX 세션 없이 tokenizer만 사용하는 ItnSeq2SeqModel (split_spans 확인용) """
+    model = ItnSeq2SeqModel.__new__(ItnSeq2SeqModel)
+    model.tokenizer = transformers.AutoTokenizer.from_pretrained(ITN_MODEL_PATH)
+    model.max_input_tokens = 128
+    suffix_length = len(model.tokenizer(" < es >", add_special_tokens=False)['input_ids'])
+    model.token_budget = model.max_input_tokens - suffix_length - model.tokenizer.num_special_tokens_to_add()
+    return model
+
+
+def test_split_spans_token_limit(seq2seq_model):
+    with open(TC_PATH, 'r', encoding='utf8') as f:
+        words = ' '.join(line.split('\t')[0] for line in f).split()
+    words += ['공일공', '일이삼사', '에이비씨', '삼십팔', '다시', 'abc', '123']
+    rng = random.Random(0)
+    for _ in range(300):
+        sentence = ' '.join(rng.choice(words) for _ in range(rng.randint(40, 200)))
+        spans = seq2seq_model.split_spans(sentence)
+        assert ' '.join(sentence[start:end] for start, end in spans) == sentence
+        for start, end in spans:
+            assert seq2seq_model.count_input_tokens(sentence[start:end]) <= seq2seq_model.max_input_tokens
+
+
+def test_split_spans_short_sentence(seq2seq_model):
+    assert seq2seq_model.split_spans('공일공 일이삼사 오육칠팔') == [(0, 13)]
+
+
+class EchoGenerator:
+    """ 입력 token을 그대로 출력하는 seq2seq 세션 대용 (모델 입력 길이 확인) """
+
+    def __init__(self):
+        self.input_ids_list = list()
+
+    def generate_batch(self, input_ids_list, max_length=190):
+        self.input_ids_list.extend(input_ids_list)
+        return [np.asarray(input_ids) for input_ids in input_ids_list]
+
+
+def test_decode_batch_token_limit(seq2seq_model):
+    from entity import ItnEntity
+    from metrics import NULL_METRICS
+    from model import ItnModel, ItnModelBatch
+
+    model = ItnModel(os.path.join(os.path.dirname(__file__), '..', 'model'), lazy=True)
+    seq2seq_model.return_tensors = 'np'
+    seq2seq_model.metrics = NULL_METRICS
+    seq2seq_model.itn_model = EchoGenerator()
+    model._itn_model = seq2seq_model
+
+    text = ' '.join(['주소는 서울시 은평구 사당로이십사길 삼십팔 다시 칠 입니다'] * 12)
+    assert seq2seq_model.count_input_tokens(text) > 200
+    entity = ItnEntity(1, text)
+    entity_lists = model.decode_batch(ItnModelBatch([[]], [(0, entity)], set()))
+    assert entity_lists == [[entity]]
+    input_ids_list = seq2seq_model.itn_model.input_ids_list
+    assert len(input_ids_list) > 1
+    assert all(len(input_ids) <= seq2seq_model.max_input_tokens for input_ids in input_ids_list)
+    assert entity.itn_text.replace(' ', '') == text.replace(' ', '')
+
+
+def test_classifier_long_row_does_not_fail_batch():
+    from config import OnnxRuntimeConfig
+    from model import ItnClsStatus, ItnSequenceClassificationModel
+
+    classifier = ItnSequenceClassificationModel(os.path.join(os.path.dirname(__file__), '..', 'model', 'itncls'),
+                                                runtime_config=OnnxRuntimeConfig(backend='onnxruntime'))
+    long_text = '네 고객님 확인 도와드리겠습니다 ' * 20
+    assert len(long_text) > classifier.max_input_length
+    texts = ['상담사', long_text, '네 확인 부탁드립니다']
+    results = classifier.inference_batch(texts)
+    assert results[1] == ItnClsStatus.DO_ITN
+    assert results[0] == classifier.inference_batch(texts[:1])[0]
+    assert results[2] == classifier.inference_batch(texts[2:])[0]
+    assert classifier.inference_batch([long_text]) == [ItnClsStatus.DO_ITN]
+
+
+def test_classifier_character_check_on_raw_text(monkeypatch):
+    from config import OnnxRuntimeConfig
+    from model import ItnSequenceClassificationModel
+
+    classifier = ItnSequenceClassificationModel(os.path.join(os.path.dirname(__file__), '..', 'model', 'itncls'),
+                                                runtime_config=OnnxRuntimeConfig(backend='onnxruntime'))
+    checked = list()
+    character_check = classifier.character_check
+    monkeypatch.setattr(classifier, 'character_check', lambda text: checked.append(text) or character_check(text))
+    texts = ['네 감사합니다', '상담사 이은영이라고 합니다']
+    classifier.inference_batch(texts)
+    classifier.inference(texts[0])
+    # " < es >"는 확인하지 않음 (알파벳 es가 후보로 판단되지 않도록)
+    assert checked == texts + texts[:1]
+    assert [character_check(text) for text in texts] == [0, 0]
+
+
+class AllItnClassifier:
+    def inference_batch(self, text_list):
+        from model import ItnClsStatus
+        return [ItnClsStatus.DO_ITN] * len(text_list)
+
+
+class ReadingConverter:
+    """ 숫자 표현 단어만 숫자로 바꾸고 입력을 기록하는 seq2seq 모델 """
+    readings = {'칠이일이이구': '721229', '삼십팔': '38'}
+
+    def __init__(self):
+        self.text_list = list()
+
+    def inference_batch(self, text_list):
+        self.text_list.extend(text_list)
+        return [' '.join(self.readings.get(word, word) for word in text.split(' ')) for text in text_list]
+
+
+def test_span_window_stitching():
+    from entity import ItnData, ItnEntity, ItnEntityStatus
+    from model import ItnModel
+
+    model = ItnModel(os.path.join(os.path.dirname(__file__), '..', 'model'), lazy=True, span_window=1)
+    model._itn_cls_model = AllItnClassifier()
+    model._itn_model = ReadingConverter()
+
+    text = '안녕하세요 상담사 이은영입니다 생일은 칠이일이이구 이고 주소는 사당로 삼십팔 입니다'
+    entities = model.process([ItnEntity(1, text)])
+
+    # 숫자 표현 단어와 앞뒤 한 단어만 seq2seq 모델로 변환 (일반 단어의 한 글자 표현은 구간을 만들지 않음)
+    assert model._itn_model.text_list == ['생일은 칠이일이이구 이고', '사당로 삼십팔 입니다']
+    assert [(entity.idx, entity.text, entity.itn_text) for entity in entities] == [
+        (1, '안녕하세요 상담사 이은영입니다', '안녕하세요 상담사 이은영입니다'),
+        (2, '생일은 칠이일이이구 이고', '생일은 721229 이고'),
+        (3, '주소는', '주소는'),
+        (4, '사당로 삼십팔 입니다', '사당로 38 입니다'),
+    ]
+    assert all(entity.source.text[entity.start:entity.end] == entity.text for entity in entities)
+    # 구간 사이의 공백은 한 번만 표시
+    assert [(entity.blank_l, entity.blank_r) for entity in entities] == [
+        (False, True), (False, False), (True, True), (False, False)]
+    assert all(entity.status == ItnEntityStatus.MODEL for entity in entities)
+    assert str(ItnData(entities)) == '안녕하세요 상담사 이은영입니다 생일은 721229 이고 주소는 사당로 38 입니다'
+
+
+def test_span_window_whole_text():
+    from entity import ItnEntity
+    from model import ItnModel
+
+    model = ItnModel(os.path.join(os.path.dirname(__file__), '..', 'model'), lazy=True, span_window=1)
+    model._itn_cls_model = AllItnClassifier()
+    model._itn_model = ReadingConverter()
+
+    # 구간이 없으면 entity 전체를 변환
+    entity = ItnEntity(1, ' 안녕하세요 상담사입니다 ')
+    assert model.split_windows(entity) == [(entity, True)]
+    entities = model.process([entity])
+    assert model._itn_model.text_list == ['안녕하세요 상담사입니다']
+    assert (entities[0].blank_l, entities[0].blank_r) == (True, True)
@@ -0,0 +1,124 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import pytest
+from onnx_backend import OnnxSeq2SeqGenerator
+
+START, PAD, EOS = 0, 1, 2
+VOCAB_SIZE = 10
+# 입력 첫 token별로 생성할 token (EOS가 없으면 길이 한도에서 forced EOS)
+SCRIPTS = {
+    5: [5, 6, EOS],
+    6: [6, 6, 6, EOS],
+    7: [7] * 20,
+    8: [8] * 20,
+}
+
+
+class StubEncoder:
+    def run(self, output_names, feed):
+        # 입력 첫 token을 hidden state로 전달하여 decoder가 행을 구분
+        return [feed['input_ids'][:, :, None].astype(np.float32)]
+
+
+class StubDecoder:
+    """ 행별 SCRIPTS 순서대로 token을 생성하는 decoder (past가 있으면 지금까지 생성한 길이를 past에서 계산) """
+
+    def __init__(self, with_past):
+        self.with_past = with_past
+        self.batch_sizes = list()
+
+    def run(self, output_names, feed):
+        rows = feed['encoder_hidden_states'][:, 0, 0].astype(np.int64)
+        input_ids = feed['input_ids']
+        self.batch_sizes.append(len(rows))
+        if self.with_past:
+            past = feed['past_key_values.0.decoder.key']
+            # 행이 제외된 후에도 past가 같은 행의 값인지 확인
+            assert (past[:, 0, :, 0] == rows[:, None]).all()
+            assert (feed['past_key_values.0.encoder.key'][:, 0, 0, 0] == rows).all()
+            num_tokens = past.shape[2] + input_ids.shape[1]
+        else:
+            num_tokens = input_ids.shape[1]
+
+        logits = np.zeros((len(rows), input_ids.shape[1], VOCAB_SIZE), dtype=np.float32)
+        for pos, row in enumerate(rows):
+            script = SCRIPTS[int(row)]
+            logits[pos, -1, script[min(num_tokens, len(script)) - 1]] = 1.0
+        outputs = {
+            'logits': logits,
+            'present.0.decoder.key': np.broadcast_to(rows[:, None, None, None], (len(rows), 1, num_tokens, 1)).copy(),
+            'present.0.encoder.key': np.broadcast_to(rows[:, None, None, None], (len(rows), 1, 3, 1)).copy(),
+        }
+        return [outputs[name] for name in output_names]
+
+
+def make_generator(with_past=True, bucket_size=16):
+    generator = OnnxSeq2SeqGenerator.__new__(OnnxSeq2SeqGenerator)
+    generator.encoder = StubEncoder()
+    generator.encoder_input_names = {'input_ids', 'attention_mask'}
+    generator.decoder = StubDecoder(with_past=False)
+    generator.decoder_input_names = {'input_ids', 'encoder_hidden_states', 'encoder_attention_mask'}
+    generator.decoder_output_names = ['logits', 'present.0.decoder.key', 'present.0.encoder.key']
+    generator.decoder_with_past = None
+    if with_past:
+        generator.decoder_with_past = StubDecoder(with_past=True)
+        generator.decoder_with_past_input_names = generator.decoder_input_names | {
+            'past_key_values.0.decoder.key', 'past_key_values.0.encoder.key'}
+        generator.decoder_with_past_output_names = ['logits', 'present.0.decoder.key']
+    generator.length_ratio = 1.0
+    generator.length_margin = 2
+    generator.bucket_size = bucket_size
+    generator.decoder_start_token_id = START
+    generator.eos_token_id = EOS
+    generator.pad_token_id = PAD
+    generator.forced_eos_token_id = EOS
+    return generator
+
+
+INPUT_IDS = np.array([
+    [5, 3, 3, PAD, PAD, PAD],  # 길이 3 -> 한도 5, 4번째 token에서 EOS
+    [7, 3, 3, 3, 3, 3],  # 길이 6 -> 한도 8, EOS 없음
+    [8, 3, PAD, PAD, PAD, PAD],  # 길이 2 -> 한도 4, EOS 없음
+])
+ATTENTION_MASK = (INPUT_IDS != PAD).astype(np.int64)
+
+
+@pytest.mark.parametrize('with_past', [True, False])
+def test_generate_per_row_budget(with_past):
+    generator = make_generator(with_past=with_past)
+    output_ids = generator.generate(INPUT_IDS, ATTENTION_MASK, max_length=190)
+    assert output_ids.tolist() == [
+        [START, 5, 6, EOS, PAD, PAD, PAD, PAD],
+        # 행별 한도의 마지막 위치에서 forced EOS
+        [START, 7, 7, 7, 7, 7, 7, EOS],
+        [START, 8, 8, EOS, PAD, PAD, PAD, PAD],
+    ]
+    # EOS를 생성했거나 한도에 도달한 행은 이후 step에서 제외
+    decoder = generator.decoder_with_past if with_past else generator.decoder
+    batch_sizes = decoder.batch_sizes if with_past else decoder.batch_sizes[1:]
+    assert generator.decoder.batch_sizes[0] == 3
+    assert batch_sizes == [3, 3, 1, 1, 1, 1]
+
+
+def test_generate_max_length():
+    generator = make_generator()
+    output_ids = generator.generate(INPUT_IDS, ATTENTION_MASK, max_length=3)
+    assert output_ids.tolist() == [[START, 5, EOS], [START, 7, EOS], [START, 8, EOS]]
+
+
+def test_generate_batch_restores_order():
+    generator = make_generator(bucket_size=2)
+    input_ids_list = [[7, 3, 3, 3, 3, 3], [5, 3, 3], [6, 3, 3, 3], [8, 3]]
+    outputs = generator.generate_batch(input_ids_list, max_length=190)
+    expected = [
+        [START, 7, 7, 7, 7, 7, 7, EOS],
+        [START, 5, 6, EOS],
+        [START, 6, 6, 6, EOS],
+        [START, 8, 8, EOS],
+    ]
+    # 길이가 비슷한 입력끼리 묶어 padding하므로 bucket 안의 짧은 결과는 PAD로 채워짐
+    assert [[token for token in output if token != PAD] for output in outputs] == expected
+    assert generator.decoder.batch_sizes == [2, 2]
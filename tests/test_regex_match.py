@@ -0,0 +1,58 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from entity import ItnEntity, ItnEntityStatus
+from regex_match import RegexMatcher
+
+matcher = RegexMatcher()
+
+
+@pytest.mark.parametrize('text', [
+    '앞으로 이 문제는',
+    '이걸로 이 상품',
+    '회사로 오 분',
+    '이쪽으로 일 번',
+    '서로 이십 분 걸려요',
+    '사당로 오 번지',
+    '계획대로 이사 완료했습니다',
+    '원래대로 오일 교환',
+    '마음대로 사이 좋게',
+    '그대로 이십 분',
+    '다시 원래대로 오일 교환',
+    '은평구 그대로 이십 분',
+    '안양천서로 삼일일',
+    '사당로이십사길 삼십팔 분',
+])
+def test_road_false_positives(text):
+    assert matcher.find(text) == []
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('양천구 안양천서로 삼일일', [(10, 13, '311')]),
+    ('사당로이십사길 삼십팔 번지', [(8, 11, '38')]),
+    ('은평구 사당로이십사길 삼십팔', [(12, 15, '38')]),
+    ('종로구 세종대로 이백구 입니다', [(9, 12, '209')]),
+    ('서울시 세종대로 이백구번지', [(9, 12, '209')]),
+])
+def test_road_number(text, expected):
+    assert matcher.find(text) == expected
+
+
+def test_road_number_before_dash():
+    # '다시'가 뒤따르면 (ex. 38-7) 모델이 변환
+    assert matcher.find('사당로이십사길 삼십팔 다시 칠') == []
+
+
+def test_process_keeps_road_name():
+    entities = matcher.process([ItnEntity(1, '주소는 양천구 안양천서로 삼일일 입니다')])
+    assert [entity.text for entity in entities] == ['주소는 양천구 안양천서로', '삼일일', '입니다']
+    assert entities[1].status == ItnEntityStatus.REGEX
+    assert entities[1].itn_text == '311'
+
+
+def test_other_rules():
+    assert matcher.find('공일공 일이삼사 오육칠팔') == [(0, 13, '010-1234-5678')]
+    assert matcher.find('일칠이점이삼점일구이점이일칠') == [(0, 14, '172.23.192.217')]
+    assert matcher.find('팔 일 삼 칠') == [(0, 7, '8137')]
@@ -0,0 +1,87 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from server import ItnServer, MicroBatcher, PipelineBatcher
+
+
+class UpperConverter:
+    def process_batch(self, texts):
+        time.sleep(0.001)
+        return [text.upper() for text in texts]
+
+
+class UpperPipeline:
+    """ 처리 중인 요청 수를 기록하는 ItnPipeline 대용 """
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def submit(self, text):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return self.executor.submit(self._process, text)
+
+    def _process(self, text):
+        time.sleep(0.0001)
+        with self.lock:
+            self.in_flight -= 1
+        return text.upper()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+async def pipelined_requests(batcher, num_requests, max_pending):
+    """ 응답을 기다리지 않고 요청을 모두 보낸 뒤, 응답을 받으면서 최대 task 수를 반환 """
+    batcher.start()
+    server = ItnServer(batcher, max_pending=max_pending)
+    listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b''.join(json.dumps({'id': idx, 'text': f'text{idx}'}).encode('utf8') + b'\n'
+                          for idx in range(num_requests)))
+
+    responses = dict()
+    max_tasks = 0
+    while len(responses) < num_requests:
+        response = json.loads(await reader.readline())
+        responses[response['id']] = response['itn_text']
+        max_tasks = max(max_tasks, len(asyncio.all_tasks()))
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    await batcher.stop()
+    assert responses == {idx: f'TEXT{idx}' for idx in range(num_requests)}
+    return max_tasks
+
+
+def test_micro_batcher_backpressure():
+    batcher = MicroBatcher(UpperConverter(), max_batch_size=8, max_wait_ms=1, max_queue_size=4)
+    max_tasks = asyncio.run(pipelined_requests(batcher, 5000, max_pending=1024))
+    # 큐(4) + 처리 중인 batch(8) + 응답 중인 task 정도만 유지
+    assert max_tasks < 32
+
+
+def test_pipeline_batcher_backpressure():
+    pipeline = UpperPipeline(queue_size=4)
+    max_tasks = asyncio.run(pipelined_requests(PipelineBatcher(pipeline), 2000, max_pending=1024))
+    assert pipeline.max_in_flight <= 4
+    assert max_tasks < 32
+
+
+def test_max_pending_per_connection():
+    batcher = MicroBatcher(UpperConverter(), max_batch_size=8, max_wait_ms=1, max_queue_size=1024)
+    max_tasks = asyncio.run(pipelined_requests(batcher, 2000, max_pending=8))
+    assert max_tasks < 32
@@ -0,0 +1,88 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from entity import ItnData, ItnEntityStatus
+from regex_match import RegexMatcher
+from streaming import ItnStreamingSession
+
+
+class RegexConverter:
+    """ 규칙 매칭만 수행하는 converter (모델 없이 entity 경계를 확인) """
+
+    def __init__(self):
+        self.matcher = RegexMatcher()
+        self.processed = list()  # process에 입력된 문자열
+
+    def process(self, text: str) -> ItnData:
+        self.processed.append(text)
+        data = ItnData.from_text(text)
+        data.itn_entity_list = self.matcher.process(data.itn_entity_list)
+        return data
+
+
+class ModelConverter(RegexConverter):
+    """ 매칭되지 않은 구간을 하나의 MODEL entity로 반환하는 converter (InverseTextNormalizer와 같은 entity 구성) """
+
+    def process(self, text: str) -> ItnData:
+        data = super().process(text)
+        for entity in data.itn_entity_list:
+            if entity.status == ItnEntityStatus.INIT:
+                entity.itn_text = entity.text
+                entity.status = ItnEntityStatus.MODEL
+        return data
+
+
+def feed_words(session, text):
+    words = text.split(' ')
+    for num_words in range(1, len(words) + 1):
+        session.feed(' '.join(words[:num_words]))
+    return session.finalize()
+
+
+TEXTS = [
+    '제 번호는 공일공 일이삼사 오육칠팔 입니다 감사합니다',
+    '네 고객님 연락처 공일공 일이삼사 오육칠팔 로 문자 드리고 주소는 안양천서로 삼일일 맞으신가요',
+    '아이피 주소는 일칠이점이삼점일구이점이일칠 이고 포트는 팔 일 삼 칠 입니다 확인 부탁드립니다',
+]
+CALL_TEXT = ('네 안녕하세요 고객님 상담사 김민지입니다 무엇을 도와드릴까요 네 지난달 요금이 평소보다 많이 나와서 '
+             '확인하고 싶어서 전화드렸어요 네 확인해 드리겠습니다 잠시만 기다려 주시겠어요 본인 확인을 위해 '
+             '성함과 생년월일 말씀 부탁드립니다 네 감사합니다 확인되었습니다')
+
+
+@pytest.mark.parametrize('converter_class', [RegexConverter, ModelConverter])
+@pytest.mark.parametrize('text', TEXTS)
+def test_finalize_equals_full_process(converter_class, text):
+    converter = converter_class()
+    session = ItnStreamingSession(converter, unstable_words=3, min_commit_words=2)
+    output = feed_words(session, text)
+    assert str(output) == str(converter.process(text))
+    assert [entity.idx for entity in output.itn_entity_list] == list(range(1, len(output) + 1))
+
+
+def test_commit_unmatched_text():
+    converter = ModelConverter()
+    session = ItnStreamingSession(converter, unstable_words=3, min_commit_words=4)
+    output = feed_words(session, CALL_TEXT)
+    assert str(output) == CALL_TEXT
+    # 매칭이 없어도 확정된 부분은 다시 처리하지 않으므로 처리하는 문자열 길이가 늘어나지 않음
+    assert max(len(text.split(' ')) for text in converter.processed) <= 3 + 4
+
+
+def test_commit_keeps_matches_across_boundary():
+    converter = ModelConverter()
+    session = ItnStreamingSession(converter, unstable_words=3, min_commit_words=1)
+    words = TEXTS[0].split(' ')
+    outputs = [str(session.feed(' '.join(words[:num_words]))) for num_words in range(1, len(words) + 1)]
+    assert session.stable_text
+    assert outputs[-1] == '제 번호는 010-1234-5678 입니다 감사합니다'
+    assert str(session.finalize()) == outputs[-1]
+
+
+def test_partial_revision_resets():
+    converter = RegexConverter()
+    session = ItnStreamingSession(converter, unstable_words=1, min_commit_words=1)
+    session.feed('제 번호는 공일공 일이삼사 오육칠팔 입니다 감사합니다')
+    output = session.feed('제 전화번호는 공일공 일이삼사 오육칠팔 이에요')
+    assert str(output) == '제 전화번호는 010-1234-5678 이에요'
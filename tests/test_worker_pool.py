@@ -0,0 +1,27 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+
+import worker_pool
+from worker_pool import ItnWorkerPool
+
+DICT_PATH = os.path.join(os.path.dirname(__file__), '..', 'dictionary', 'exact_match')
+
+
+def test_missing_model_path():
+    with pytest.raises(FileNotFoundError):
+        ItnWorkerPool(DICT_PATH, '/nonexistent', num_workers=2)
+
+
+def test_worker_init_failure(monkeypatch, tmp_path):
+    # 모델 파일 확인을 통과해도 워커 초기화가 실패하면 대기하지 않고 예외 발생
+    monkeypatch.setattr(worker_pool, '_check_model_files', lambda model_path: None)
+    start = time.monotonic()
+    with pytest.raises(BrokenProcessPool):
+        with ItnWorkerPool(DICT_PATH, str(tmp_path), num_workers=2) as pool:
+            pool.process_batch(['공일공 일이삼사 오육칠팔'])
+    assert time.monotonic() - start < 60